@@ -4,15 +4,34 @@ import sys
 
 from PySide6 import QtGui, QtWidgets
 
+from .fonts import cached_families
 from .widgets.main_window import MainWindow
 
 
+PREFERRED_FONT_FAMILY = "Noto Sans"
+# Scaled element pixmaps are cached across resizes; Qt's 10 MB default holds
+# only a couple of large images.
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024
+
+
+def _default_font() -> QtGui.QFont:
+    # Asking Qt for a missing family triggers a scan of every installed font to
+    # resolve aliases, so fall back to the platform font when it is absent.
+    family = PREFERRED_FONT_FAMILY
+    if family not in cached_families():
+        family = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.GeneralFont).family()
+    font = QtGui.QFont(family, 10)
+    font.setStyleHint(QtGui.QFont.SansSerif)
+    return font
+
+
 def main() -> None:
     app = QtWidgets.QApplication(sys.argv)
 
     # Use Fusion as a base style for consistency across platforms.
     app.setStyle("Fusion")
-    app.setFont(QtGui.QFont("Noto Sans", 10))
+    app.setFont(_default_font())
+    QtGui.QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
 
     window = MainWindow()
     window.show()
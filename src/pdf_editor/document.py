@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from itertools import count
 from pathlib import Path
-from typing import List, Optional
-import uuid
+from typing import Dict, List, Optional
 
+# Ids only need to be unique within this process; a counter is much cheaper
+# than formatting a uuid4 for every element and page.
+_id_counter = count(1)
 
-@dataclass
+
+def _new_id() -> str:
+    return f"e{next(_id_counter):x}"
+
+
+@dataclass(slots=True)
 class Rect:
     """Axis aligned rectangle helper."""
 
@@ -24,7 +32,7 @@ class Rect:
         return self.y + self.height
 
 
-@dataclass
+@dataclass(slots=True)
 class Element:
     """Base element placed on a PDF page."""
 
@@ -44,7 +52,7 @@ class Element:
         self.rect.height = max(1.0, height)
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageElement(Element):
     """Image drawn on the PDF page."""
 
@@ -52,7 +60,7 @@ class ImageElement(Element):
     image_bytes: bytes = b""
 
 
-@dataclass
+@dataclass(slots=True)
 class TextElement(Element):
     """Text drawn on the PDF page."""
 
@@ -71,24 +79,29 @@ class PageModel:
     rotation: int = 0
     source_index: Optional[int] = None
     elements: List[Element] = field(default_factory=list)
-    uid: str = field(default_factory=lambda: str(uuid.uuid4()))
+    uid: str = field(default_factory=_new_id)
     label: str = ""
     note: str = ""
+    _by_id: Dict[str, Element] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._by_id = {element.id: element for element in self.elements}
 
     def add_element(self, element: Element) -> None:
         self.elements.append(element)
+        self._by_id[element.id] = element
 
     def remove_element(self, element_id: str) -> Optional[Element]:
+        element = self._by_id.pop(element_id, None)
+        if element is None:
+            return None
         for index, elem in enumerate(self.elements):
-            if elem.id == element_id:
+            if elem is element:
                 return self.elements.pop(index)
         return None
 
     def find_element(self, element_id: str) -> Optional[Element]:
-        for element in self.elements:
-            if element.id == element_id:
-                return element
-        return None
+        return self._by_id.get(element_id)
 
 
 @dataclass
@@ -98,34 +111,46 @@ class DocumentModel:
     source_path: Path
     pages: List[PageModel] = field(default_factory=list)
 
+    _index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
     def get_page(self, index: int) -> PageModel:
         return self.pages[index]
 
     def insert_page(self, index: int, page: PageModel) -> None:
         self.pages.insert(index, page)
+        self._index.clear()
 
     def append_page(self, page: PageModel) -> None:
         self.pages.append(page)
+        self._index[page.uid] = len(self.pages) - 1
 
     def remove_page(self, index: int) -> PageModel:
-        return self.pages.pop(index)
+        page = self.pages.pop(index)
+        self._index.clear()
+        return page
 
     def find_page_by_id(self, page_id: str) -> Optional[PageModel]:
-        for page in self.pages:
-            if page.uid == page_id:
-                return page
-        return None
+        idx = self.index_of_page(page_id)
+        return self.pages[idx] if idx is not None else None
 
     def index_of_page(self, page_id: str) -> Optional[int]:
-        for idx, page in enumerate(self.pages):
-            if page.uid == page_id:
-                return idx
-        return None
+        idx = self._index.get(page_id)
+        # Pages may be reordered in place, so verify the hit and reindex on a miss.
+        if idx is not None and idx < len(self.pages) and self.pages[idx].uid == page_id:
+            return idx
+        self._index = {page.uid: position for position, page in enumerate(self.pages)}
+        return self._index.get(page_id)
 
     @property
     def page_count(self) -> int:
         return len(self.pages)
 
+    def snapshot(self) -> DocumentModel:
+        """Detached copy of pages and elements, safe to read off the UI thread."""
+
+        pages = [replace(page, elements=[clone_element(e) for e in page.elements]) for page in self.pages]
+        return DocumentModel(source_path=self.source_path, pages=pages)
+
 
 def create_image_element(
     x: float,
@@ -139,7 +164,7 @@ def create_image_element(
     """Factory helper for image elements."""
 
     return ImageElement(
-        id=str(uuid.uuid4()),
+        id=_new_id(),
         rect=Rect(x=x, y=y, width=width, height=height),
         source_path=source_path,
         image_bytes=image_bytes,
@@ -158,7 +183,7 @@ def create_text_element(
     color: str = "#000000",
 ) -> TextElement:
     return TextElement(
-        id=str(uuid.uuid4()),
+        id=_new_id(),
         rect=Rect(x=x, y=y, width=width, height=height),
         text=text,
         font_family=font_family,
@@ -170,42 +195,4 @@ def create_text_element(
 def clone_element(element: Element) -> Element:
     """Create a detached copy of an element."""
 
-    rect = Rect(
-        x=element.rect.x,
-        y=element.rect.y,
-        width=element.rect.width,
-        height=element.rect.height,
-    )
-
-    if isinstance(element, ImageElement):
-        return ImageElement(
-            id=element.id,
-            rect=rect,
-            rotation=element.rotation,
-            opacity=element.opacity,
-            locked=element.locked,
-            visible=element.visible,
-            source_path=element.source_path,
-            image_bytes=element.image_bytes,
-        )
-    if isinstance(element, TextElement):
-        return TextElement(
-            id=element.id,
-            rect=rect,
-            rotation=element.rotation,
-            opacity=element.opacity,
-            locked=element.locked,
-            visible=element.visible,
-            text=element.text,
-            font_family=element.font_family,
-            font_size=element.font_size,
-            color=element.color,
-        )
-    return Element(
-        id=element.id,
-        rect=rect,
-        rotation=element.rotation,
-        opacity=element.opacity,
-        locked=element.locked,
-        visible=element.visible,
-    )
+    return replace(element, rect=replace(element.rect))
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PySide6 import QtCore, QtGui
+
+FONT_CACHE_PATH = Path.home() / ".cache" / "pdf_editor" / "fonts.json"
+
+# Common install locations; Qt's own font paths are added at runtime.
+_FONT_DIRS = (
+    Path("/usr/share/fonts"),
+    Path("/usr/local/share/fonts"),
+    Path.home() / ".fonts",
+    Path.home() / ".local" / "share" / "fonts",
+    Path("/Library/Fonts"),
+    Path("/System/Library/Fonts"),
+    Path.home() / "Library" / "Fonts",
+    Path(os.environ.get("WINDIR", "C:/Windows")) / "Fonts",
+)
+
+
+class _RefreshFontsRunnable(QtCore.QRunnable):
+    """Re-enumerates installed font families and rewrites the cache file."""
+
+    def __init__(self, cache_path: Path, stamp: Dict[str, object]):
+        super().__init__()
+        self._cache_path = cache_path
+        self._stamp = stamp
+
+    def run(self) -> None:
+        _write_families(self._cache_path, self._stamp, QtGui.QFontDatabase.families())
+
+
+def _font_stamp() -> Dict[str, object]:
+    """Qt version plus modification times of the font directories.
+
+    Installing or removing a font changes the mtime of the directory holding
+    it, so the directories and their immediate subdirectories are stat'ed.
+    """
+
+    dirs = set(_FONT_DIRS)
+    for location in QtCore.QStandardPaths.standardLocations(QtCore.QStandardPaths.FontsLocation):
+        dirs.add(Path(location))
+    mtimes: Dict[str, int] = {}
+    for directory in dirs:
+        try:
+            mtimes[str(directory)] = directory.stat().st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        mtimes[entry.path] = entry.stat().st_mtime_ns
+        except OSError:
+            continue
+    return {"qt": QtCore.qVersion(), "dirs": mtimes}
+
+
+def _write_families(cache_path: Path, stamp: Dict[str, object], families: List[str]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"stamp": stamp, "families": families}), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _read_cache(cache_path: Path) -> Optional[dict]:
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or not isinstance(cached.get("families"), list):
+        return None
+    return cached
+
+
+def cached_families(cache_path: Path = FONT_CACHE_PATH) -> List[str]:
+    """Return installed font families, served from disk when possible.
+
+    Enumerating the font database can take seconds on systems with many fonts,
+    so the list is cached. A cache whose stamp no longer matches the installed
+    fonts is still served and refreshed in the background for the next launch.
+    """
+
+    stamp = _font_stamp()
+    cached = _read_cache(cache_path)
+    if cached is not None:
+        if cached.get("stamp") != stamp:
+            QtCore.QThreadPool.globalInstance().start(_RefreshFontsRunnable(cache_path, stamp))
+        return cached["families"]
+    families = QtGui.QFontDatabase.families()
+    _write_families(cache_path, stamp, families)
+    return families
@@ -1,124 +1,315 @@
 from __future__ import annotations
 
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
-from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
-import fitz  # PyMuPDF
-from PIL import Image
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
 
-from .document import DocumentModel, PageModel, ImageElement, TextElement
+from .document import DocumentModel, Element, PageModel, ImageElement, TextElement
 
+if TYPE_CHECKING:
+    import fitz
 
-@dataclass
-class PagePreview:
-    """Holds rendered preview data for a PDF page."""
+# PyMuPDF is heavy; it is imported on first use so that the application
+# window can come up before the library is loaded.
 
-    page_id: str
-    image_bytes: bytes
+# MuPDF shares one context between all documents and is not safe to call from
+# several threads at once, even on different documents. Every PyMuPDF call in
+# this module runs under this lock.
+_FITZ_LOCK = threading.RLock()
 
 
-class PdfImporter:
-    """Loads PDF files into editable document models."""
+@dataclass(frozen=True, slots=True)
+class RawPreview:
+    """Uncompressed RGB888 scanlines of a rendered page."""
+
+    samples: bytes
+    width: int
+    height: int
+    stride: int
+
+
+class LazyPreviewCache:
+    """Renders page previews on first access and memoizes the encoded bytes."""
+
+    # JPEG encodes far faster than PNG's DEFLATE and stays compact in memory;
+    # previews are decoded in-process right away.
+    image_format = "JPG"
+
+    def __init__(self, pdf_doc: fitz.Document, thumbnail_scale: float = 0.25):
+        self._doc = pdf_doc
+        self.thumbnail_scale = thumbnail_scale
+        self._cache: Dict[Tuple[int, float], bytes] = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get(self, index: int, scale: float = 1.0) -> bytes:
+        key = (index, scale)
+        data = self._cache.get(key)
+        if data is not None:
+            return data
+        with _FITZ_LOCK:
+            if self._closed:
+                raise ValueError("preview cache is closed")
+            data = self._cache.get(key)
+            if data is None:
+                data = self._render(index, scale)
+                self._cache[key] = data
+        return data
+
+    def render_raw(self, index: int, scale: float = 1.0) -> RawPreview:
+        """Render a page without encoding it; the result is not memoized."""
 
-    def load(self, pdf_path: Path) -> Tuple[DocumentModel, List[PagePreview]]:
-        pdf_doc = fitz.open(pdf_path)
-        pages: List[PageModel] = []
-        previews: List[PagePreview] = []
+        import fitz  # PyMuPDF
 
+        with _FITZ_LOCK:
+            if self._closed:
+                raise ValueError("preview cache is closed")
+            page = self._doc.load_page(index)
+            pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+            return RawPreview(pix.samples, pix.width, pix.height, pix.stride)
+
+    def get_thumbnail(self, index: int) -> bytes:
+        """Return a reduced-resolution preview for the page list."""
+
+        return self.get(index, self.thumbnail_scale)
+
+    def _render(self, index: int, scale: float) -> bytes:
+        import fitz  # PyMuPDF
+
+        page = self._doc.load_page(index)
         # Matrix 1.0 keeps pixel coordinates identical to PDF points, making
-        # it easier to align overlay elements.
-        render_matrix = fitz.Matrix(1.0, 1.0)
-        for index, page in enumerate(pdf_doc):
-            rect = page.rect
-            page_model = PageModel(
-                width=rect.width,
-                height=rect.height,
-                rotation=page.rotation,
-                source_index=index,
-            )
-            pages.append(page_model)
+        # it easier to align overlay elements. Thumbnails use a smaller matrix.
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        return pix.tobytes("jpg", jpg_quality=85 if scale >= 1.0 else 70)
+
+    def close(self) -> None:
+        with _FITZ_LOCK:
+            self._cache.clear()
+            self._doc.close()
+            self._closed = True
+
+
+class PdfImporter:
+    """Loads PDF files into editable document models."""
 
-            pix = page.get_pixmap(matrix=render_matrix, alpha=False)
-            previews.append(PagePreview(page_id=page_model.uid, image_bytes=pix.tobytes("png")))
+    def __init__(self, preview_scale: float = 0.25):
+        # Scale used for page-list thumbnails; the canvas always renders at 1.0.
+        self.preview_scale = preview_scale
 
-        pdf_doc.close()
+    def load(self, pdf_path: Path) -> Tuple[DocumentModel, LazyPreviewCache]:
+        import fitz  # PyMuPDF
+
+        with _FITZ_LOCK:
+            pdf_doc = fitz.open(pdf_path)
+            pages: List[PageModel] = []
+            for page in pdf_doc:
+                rect = page.rect
+                pages.append(
+                    PageModel(
+                        width=rect.width,
+                        height=rect.height,
+                        rotation=page.rotation,
+                        source_index=page.number,
+                    )
+                )
+        # The document stays open so pages can be rendered when first shown.
+        previews = LazyPreviewCache(pdf_doc, thumbnail_scale=self.preview_scale)
         return DocumentModel(source_path=pdf_path, pages=pages), previews
 
 
+@lru_cache(maxsize=256)
+def _color_to_rgb(color: str) -> tuple[float, float, float]:
+    color = color.lstrip("#")
+    if len(color) != 6:
+        return (0, 0, 0)
+    r = int(color[0:2], 16) / 255
+    g = int(color[2:4], 16) / 255
+    b = int(color[4:6], 16) / 255
+    return (r, g, b)
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before the file is written."""
+
+
 class PdfExporter:
     """Writes the document model back to a PDF file."""
 
-    def export(self, document: DocumentModel, target_path: Path) -> None:
-        source_doc = fitz.open(document.source_path)
-        output = fitz.open()
+    def export(
+        self,
+        document: DocumentModel,
+        target_path: Path,
+        *,
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        import fitz  # PyMuPDF
+
+        with self._source_document(document) as source_doc:
+            with _FITZ_LOCK:
+                output = fitz.open()
+            try:
+                self._write_pages(document, source_doc, output, progress, is_cancelled)
+                with _FITZ_LOCK:
+                    # Images are already compressed (JPEG/Flate); deflating them
+                    # again costs CPU for no size gain. Repeated images already
+                    # share one xref, so garbage=1 only drops unused objects
+                    # instead of comparing every stream as garbage=4 would.
+                    output.save(
+                        target_path,
+                        garbage=1,
+                        deflate=True,
+                        deflate_images=False,
+                        deflate_fonts=True,
+                    )
+            finally:
+                with _FITZ_LOCK:
+                    output.close()
+
+    @contextmanager
+    def _source_document(self, document: DocumentModel) -> Iterator[Optional[fitz.Document]]:
+        # Exports run off the UI thread, so they open their own handle rather
+        # than holding the preview cache's document for the whole write.
+        if all(page.source_index is None for page in document.pages):
+            yield None
+            return
+
+        import fitz  # PyMuPDF
+
+        with _FITZ_LOCK:
+            source_doc = fitz.open(document.source_path)
         try:
-            for page_model in document.pages:
-                new_page = output.new_page(width=page_model.width, height=page_model.height)
-                if page_model.source_index is not None:
-                    new_page.show_pdf_page(new_page.rect, source_doc, page_model.source_index)
-
-                for element in page_model.elements:
-                    if isinstance(element, ImageElement):
-                        if not element.visible:
-                            continue
-                        rect = fitz.Rect(
-                            element.rect.x,
-                            element.rect.y,
-                            element.rect.x + element.rect.width,
-                            element.rect.y + element.rect.height,
-                        )
-                        if element.image_bytes:
-                            stream = self._prepare_image_stream(element)
-                            new_page.insert_image(
-                                rect,
-                                stream=stream,
-                                keep_proportion=False,
-                            )
-                    elif isinstance(element, TextElement):
-                        if not element.visible:
-                            continue
-                        rect = fitz.Rect(
-                            element.rect.x,
-                            element.rect.y,
-                            element.rect.x + element.rect.width,
-                            element.rect.y + element.rect.height,
-                        )
-                        color = self._color_to_rgb(element.color)
-                        new_page.insert_textbox(
-                            rect,
-                            element.text,
-                            fontsize=element.font_size,
-                            fontname="helv",
-                            color=color,
-                            align=0,
-                        )
-            output.save(target_path)
+            yield source_doc
         finally:
-            output.close()
-            source_doc.close()
-
-    def _prepare_image_stream(self, element: ImageElement) -> bytes:
-        """Apply opacity if needed before embedding."""
-
-        if element.opacity >= 0.999:
-            return element.image_bytes
-
-        with Image.open(BytesIO(element.image_bytes)) as img:
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-            alpha = img.split()[3]
-            alpha = alpha.point(lambda p: int(p * element.opacity))
-            img.putalpha(alpha)
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            return buffer.getvalue()
-
-    def _color_to_rgb(self, color: str) -> tuple[float, float, float]:
-        color = color.lstrip("#")
-        if len(color) != 6:
-            return (0, 0, 0)
-        r = int(color[0:2], 16) / 255
-        g = int(color[2:4], 16) / 255
-        b = int(color[4:6], 16) / 255
-        return (r, g, b)
+            with _FITZ_LOCK:
+                source_doc.close()
+
+    def _write_pages(
+        self,
+        document: DocumentModel,
+        source_doc: Optional[fitz.Document],
+        output: fitz.Document,
+        progress: Optional[Callable[[int, int], None]],
+        is_cancelled: Optional[Callable[[], bool]],
+    ) -> None:
+        import fitz  # PyMuPDF
+
+        # Opacity graphics states are shared by all pages: permille -> xref.
+        gstates: Dict[int, int] = {}
+        # Image payload (by object identity) -> xref of its first insertion.
+        # Identical images share one bytes object in the model.
+        images: Dict[int, int] = {}
+        total = document.page_count
+        for page_number, page_model in enumerate(document.pages):
+            if is_cancelled and is_cancelled():
+                raise ExportCancelled()
+            # The lock is taken per page so renders for the UI can run
+            # between pages of a long export.
+            with _FITZ_LOCK:
+                self._write_page(page_model, source_doc, output, gstates, images)
+            if progress:
+                progress(page_number + 1, total)
+
+    def _write_page(
+        self,
+        page_model: PageModel,
+        source_doc: Optional[fitz.Document],
+        output: fitz.Document,
+        gstates: Dict[int, int],
+        images: Dict[int, int],
+    ) -> None:
+        import fitz  # PyMuPDF
+
+        new_page = output.new_page(width=page_model.width, height=page_model.height)
+        if page_model.source_index is not None:
+            new_page.show_pdf_page(new_page.rect, source_doc, page_model.source_index)
+
+        for element in self._drawable_elements(page_model):
+            rect = fitz.Rect(
+                element.rect.x,
+                element.rect.y,
+                element.rect.x + element.rect.width,
+                element.rect.y + element.rect.height,
+            )
+            if isinstance(element, ImageElement):
+                if element.image_bytes:
+                    self._insert_image(output, new_page, rect, element, gstates, images)
+            elif isinstance(element, TextElement):
+                # The base-14 Helvetica is referenced, not embedded, and a box
+                # too small for its text is left empty.
+                new_page.insert_textbox(
+                    rect,
+                    element.text,
+                    fontsize=element.font_size,
+                    fontname="helv",
+                    color=_color_to_rgb(element.color),
+                    align=0,
+                )
+
+    def _drawable_elements(self, page_model: PageModel) -> List[Element]:
+        """Skip elements that would draw nothing: hidden, transparent or empty."""
+
+        return [
+            element
+            for element in page_model.elements
+            if element.visible
+            and element.opacity > 0.001
+            and element.rect.width * element.rect.height > 0.25
+        ]
+
+    def _insert_image(
+        self,
+        output: fitz.Document,
+        page: fitz.Page,
+        rect: fitz.Rect,
+        element: ImageElement,
+        gstates: Dict[int, int],
+        images: Dict[int, int],
+    ) -> None:
+        contents_before = len(page.get_contents())
+        key = id(element.image_bytes)
+        xref = images.get(key)
+        if xref:
+            page.insert_image(rect, xref=xref, keep_proportion=False)
+        else:
+            images[key] = page.insert_image(rect, stream=element.image_bytes, keep_proportion=False)
+        opacity_permille = round(element.opacity * 1000)
+        if opacity_permille >= 999:
+            return
+        # Opacity is applied with a PDF graphics state around the drawing
+        # operators instead of re-encoding the image with scaled alpha.
+        # insert_image appends its drawing operators as the last content stream.
+        contents = page.get_contents()
+        if len(contents) <= contents_before:
+            return
+        name = self._opacity_state(output, page, opacity_permille, gstates)
+        xref = contents[-1]
+        stream = output.xref_stream(xref)
+        output.update_stream(xref, b"q\n/" + name.encode() + b" gs\n" + stream + b"\nQ\n")
+
+    def _opacity_state(
+        self,
+        output: fitz.Document,
+        page: fitz.Page,
+        opacity_permille: int,
+        gstates: Dict[int, int],
+    ) -> str:
+        name = f"pdfeGS{opacity_permille:03d}"
+        xref = gstates.get(opacity_permille)
+        if xref is None:
+            opacity = opacity_permille / 1000
+            xref = output.get_new_xref()
+            output.update_object(xref, f"<</Type/ExtGState/CA {opacity:g}/ca {opacity:g}>>")
+            gstates[opacity_permille] = xref
+        kind, resources = output.xref_get_key(page.xref, "Resources")
+        if kind == "xref":
+            output.xref_set_key(int(resources.split()[0]), f"ExtGState/{name}", f"{xref} 0 R")
+        else:
+            output.xref_set_key(page.xref, f"Resources/ExtGState/{name}", f"{xref} 0 R")
+        return name
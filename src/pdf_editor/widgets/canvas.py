@@ -1,10 +1,412 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+import hashlib
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from ..document import Element, PageModel, ImageElement, TextElement
+from ..workers import ImageDecodeRunnable
+
+
+# Decoded element images keyed by content hash, shared across page rebuilds.
+# Bounded by decoded size, since one scan can outweigh dozens of icons.
+_PIXMAP_CACHE: "OrderedDict[bytes, QtGui.QPixmap]" = OrderedDict()
+_PIXMAP_CACHE_LIMIT_BYTES = 256 * 1024 * 1024
+_pixmap_cache_bytes = 0
+_placeholder: Optional[QtGui.QPixmap] = None
+
+
+# Digest memo by bytes identity; elements keep their image_bytes object for
+# life, so rebuilds of the same page need not re-hash every image.
+_KEY_MEMO: "OrderedDict[int, Tuple[bytes, bytes]]" = OrderedDict()
+_KEY_MEMO_LIMIT = 256
+
+
+def _image_key(data: bytes) -> bytes:
+    entry = _KEY_MEMO.get(id(data))
+    if entry is not None and entry[0] is data:
+        _KEY_MEMO.move_to_end(id(data))
+        return entry[1]
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    _KEY_MEMO[id(data)] = (data, key)
+    while len(_KEY_MEMO) > _KEY_MEMO_LIMIT:
+        _KEY_MEMO.popitem(last=False)
+    return key
+
+
+def _cached_pixmap(key: bytes) -> Optional[QtGui.QPixmap]:
+    pixmap = _PIXMAP_CACHE.get(key)
+    if pixmap is not None:
+        _PIXMAP_CACHE.move_to_end(key)
+    return pixmap
+
+
+def _pixmap_bytes(pixmap: QtGui.QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+def _store_pixmap(key: bytes, pixmap: QtGui.QPixmap) -> None:
+    global _pixmap_cache_bytes
+    previous = _PIXMAP_CACHE.pop(key, None)
+    if previous is not None:
+        _pixmap_cache_bytes -= _pixmap_bytes(previous)
+    _PIXMAP_CACHE[key] = pixmap
+    _pixmap_cache_bytes += _pixmap_bytes(pixmap)
+    while _pixmap_cache_bytes > _PIXMAP_CACHE_LIMIT_BYTES and len(_PIXMAP_CACHE) > 1:
+        _, evicted = _PIXMAP_CACHE.popitem(last=False)
+        _pixmap_cache_bytes -= _pixmap_bytes(evicted)
+
+
+def _release_images() -> None:
+    """Drop every decoded pixmap and digest memo entry, and the bytes they pin."""
+
+    global _pixmap_cache_bytes
+    _PIXMAP_CACHE.clear()
+    _pixmap_cache_bytes = 0
+    _KEY_MEMO.clear()
+
+
+def _placeholder_pixmap() -> QtGui.QPixmap:
+    """Flat tile shown, stretched to the element rect, until decoding ends."""
+
+    global _placeholder
+    if _placeholder is None:
+        _placeholder = QtGui.QPixmap(1, 1)
+        _placeholder.fill(QtGui.QColor("#e0e0e0"))
+    return _placeholder
+
+
+SnapRequest = Callable[[str, float, float, float, float], Tuple[float, float]]
+
+
+class _SnapThrottle:
+    """Rate-limits snap requests while an item is being dragged.
+
+    Requests within ``INTERVAL_NS`` of the last evaluation, or for sub-pixel
+    moves, reuse the previous snap offset instead of rescanning the page.
+    """
+
+    __slots__ = ("_last_ns", "_last_raw", "_pending_raw", "_offset")
+
+    INTERVAL_NS = 8_000_000
+
+    def __init__(self) -> None:
+        self._last_ns = 0
+        self._last_raw: Optional[Tuple[float, float]] = None
+        self._pending_raw: Optional[Tuple[float, float]] = None
+        self._offset = (0.0, 0.0)
+
+    def snap(
+        self,
+        request: SnapRequest,
+        element_id: str,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        *,
+        force: bool = False,
+    ) -> Tuple[float, float]:
+        self._pending_raw = (x, y)
+        now = time.monotonic_ns()
+        if not force and self._last_raw is not None:
+            sub_pixel = abs(x - self._last_raw[0]) < 1.0 and abs(y - self._last_raw[1]) < 1.0
+            if sub_pixel or now - self._last_ns < self.INTERVAL_NS:
+                return x + self._offset[0], y + self._offset[1]
+        snapped_x, snapped_y = request(element_id, x, y, width, height)
+        self._last_ns = now
+        self._last_raw = (x, y)
+        self._offset = (snapped_x - x, snapped_y - y)
+        return snapped_x, snapped_y
+
+    def take_pending(self) -> Optional[Tuple[float, float]]:
+        """Return the last raw position if it was answered from the throttle."""
+
+        pending = self._pending_raw
+        self._pending_raw = None
+        if pending is None or pending == self._last_raw:
+            return None
+        return pending
+
+
+class _GeometryGate:
+    """Coalesces geometry notifications while the pointer is held down.
+
+    Between ``begin`` and ``end`` at most one notification per
+    ``INTERVAL_NS`` passes; ``end`` reports whether one was swallowed.
+    """
+
+    __slots__ = ("_active", "_pending", "_last_ns")
+
+    INTERVAL_NS = 16_000_000
+
+    def __init__(self) -> None:
+        self._active = False
+        self._pending = False
+        self._last_ns = 0
+
+    def begin(self) -> None:
+        self._active = True
+        self._pending = False
+        self._last_ns = 0
+
+    def allow(self) -> bool:
+        if not self._active:
+            return True
+        now = time.monotonic_ns()
+        if now - self._last_ns < self.INTERVAL_NS:
+            self._pending = True
+            return False
+        self._last_ns = now
+        self._pending = False
+        return True
+
+    def end(self) -> bool:
+        pending = self._active and self._pending
+        self._active = False
+        self._pending = False
+        return pending
+
+
+def _notify_geometry(item: QtWidgets.QGraphicsItem) -> None:
+    if item._geometry_gate.allow():
+        item._emit_geometry_changed()
+
+
+def _set_pos_unsnapped(item: QtWidgets.QGraphicsItem, x: float, y: float) -> None:
+    """Move ``item`` to a model position without running the snapper."""
+
+    item._applying_snap = True
+    try:
+        item.setPos(x, y)
+    finally:
+        item._applying_snap = False
+
+
+def _set_model_pos(item: QtWidgets.QGraphicsItem, x: float, y: float) -> None:
+    """Apply a position that came from the model.
+
+    Geometry notifications are switched off so itemChange is skipped: the
+    value needs neither snapping nor writing back to the model.
+    """
+
+    flag = QtWidgets.QGraphicsItem.ItemSendsGeometryChanges
+    item.setFlag(flag, False)
+    try:
+        item.setPos(x, y)
+    finally:
+        item.setFlag(flag, True)
+
+
+def _flush_snap(item: QtWidgets.QGraphicsItem, width: float, height: float) -> None:
+    """Evaluate the final drag position so it is never throttled away."""
+
+    pending = item._snap_throttle.take_pending()
+    if pending is None or not item._on_snap_request:
+        return
+    snapped_x, snapped_y = item._snap_throttle.snap(
+        item._on_snap_request,
+        item.element_id,
+        pending[0],
+        pending[1],
+        width,
+        height,
+        force=True,
+    )
+    item._snap_throttle.take_pending()
+    _set_pos_unsnapped(item, snapped_x, snapped_y)
+
+
+SnapTarget = Tuple[float, int, int, str]
+
+
+_page_order = itemgetter(1, 2)
+
+
+class _SnapIndex:
+    """Sorted edge/centre coordinates of the page elements used for snapping.
+
+    Each axis keeps ``(coord, order, slot, element_id)`` entries sorted by
+    coordinate so a drag only inspects targets inside the threshold band.
+    """
+
+    __slots__ = ("_xs", "_ys", "_entries", "_order")
+
+    def __init__(self, elements: Iterable[Element] = ()) -> None:
+        self._xs: List[SnapTarget] = []
+        self._ys: List[SnapTarget] = []
+        self._entries: Dict[str, Tuple[List[SnapTarget], List[SnapTarget]]] = {}
+        self._order: Dict[str, int] = {}
+        for order, element in enumerate(elements):
+            self._order[element.id] = order
+            entries = self._targets(element)
+            if entries:
+                self._xs.extend(entries[0])
+                self._ys.extend(entries[1])
+        self._xs.sort()
+        self._ys.sort()
+
+    def update(self, element: Element) -> None:
+        self.remove(element.id)
+        self._order.setdefault(element.id, len(self._order))
+        entries = self._targets(element)
+        if not entries:
+            return
+        for entry in entries[0]:
+            insort(self._xs, entry)
+        for entry in entries[1]:
+            insort(self._ys, entry)
+
+    def remove(self, element_id: str) -> None:
+        entries = self._entries.pop(element_id, None)
+        if not entries:
+            return
+        for axis, axis_entries in ((self._xs, entries[0]), (self._ys, entries[1])):
+            for entry in axis_entries:
+                index = bisect_left(axis, entry)
+                if index < len(axis) and axis[index] == entry:
+                    del axis[index]
+
+    def near_x(self, bands: Iterable[float], threshold: float) -> List[SnapTarget]:
+        return self._query(self._xs, bands, threshold)
+
+    def near_y(self, bands: Iterable[float], threshold: float) -> List[SnapTarget]:
+        return self._query(self._ys, bands, threshold)
+
+    def _targets(self, element: Element) -> Optional[Tuple[List[SnapTarget], List[SnapTarget]]]:
+        if not element.visible:
+            return None
+        order = self._order[element.id]
+        rect = element.rect
+        xs = [
+            (rect.x, order, 0, element.id),
+            (rect.x + rect.width / 2, order, 1, element.id),
+            (rect.x + rect.width, order, 2, element.id),
+        ]
+        ys = [
+            (rect.y, order, 0, element.id),
+            (rect.y + rect.height / 2, order, 1, element.id),
+            (rect.y + rect.height, order, 2, element.id),
+        ]
+        self._entries[element.id] = (xs, ys)
+        return xs, ys
+
+    @staticmethod
+    def _query(axis: List[SnapTarget], bands: Iterable[float], threshold: float) -> List[SnapTarget]:
+        hits: List[SnapTarget] = []
+        for coord in bands:
+            start = bisect_right(axis, (coord - threshold,))
+            stop = bisect_left(axis, (coord + threshold,), start)
+            if start < stop:
+                hits.extend(axis[start:stop])
+        if len(hits) < 2:
+            return hits
+        # Visit hits in page order, as the linear scan over the page did.
+        return sorted(set(hits), key=_page_order)
+
+
+_HANDLE_NAMES = (
+    ("top-left", "top", "top-right"),
+    ("left", None, "right"),
+    ("bottom-left", "bottom", "bottom-right"),
+)
+
+
+def _handle_band(value: float, length: float, size: float) -> Optional[int]:
+    """Return 0/1/2 for the near, middle or far handle band along one axis."""
+
+    if 0.0 <= value <= size:
+        return 0
+    middle = max(0.0, length / 2.0 - size / 2.0)
+    if middle <= value <= middle + size:
+        return 1
+    far = max(0.0, length - size)
+    if far <= value <= far + size:
+        return 2
+    return None
+
+
+def _hit_handle_at(pos: QtCore.QPointF, width: float, height: float, size: float) -> Optional[str]:
+    x = pos.x()
+    y = pos.y()
+    # Handles sit on the border, so anything deeper inside is a plain hover.
+    if size < x < width - size and size < y < height - size:
+        return None
+    col = _handle_band(x, width, size)
+    if col is None:
+        return None
+    row = _handle_band(y, height, size)
+    if row is None:
+        return None
+    return _HANDLE_NAMES[row][col]
+
+
+# (left, right, top, bottom) edges moved by each handle.
+_HANDLE_DELTAS: Dict[str, Tuple[int, int, int, int]] = {
+    "top-left": (1, 0, 1, 0),
+    "top": (0, 0, 1, 0),
+    "top-right": (0, 1, 1, 0),
+    "right": (0, 1, 0, 0),
+    "bottom-right": (0, 1, 0, 1),
+    "bottom": (0, 0, 0, 1),
+    "bottom-left": (1, 0, 0, 1),
+    "left": (1, 0, 0, 0),
+}
+
+
+def _resized_geometry(
+    initial: QtCore.QRectF,
+    mask: Tuple[int, int, int, int],
+    delta: QtCore.QPointF,
+    min_size: float,
+) -> Tuple[float, float, float, float]:
+    """Apply a handle drag to ``initial`` and return ``(x, y, width, height)``."""
+
+    move_left, move_right, move_top, move_bottom = mask
+    dx = delta.x()
+    dy = delta.y()
+    left = initial.left()
+    right = initial.right()
+    top = initial.top()
+    bottom = initial.bottom()
+    if move_left:
+        left = min(left + dx, right - min_size)
+    if move_right:
+        right = max(right + dx, left + min_size)
+    if move_top:
+        top = min(top + dy, bottom - min_size)
+    if move_bottom:
+        bottom = max(bottom + dy, top + min_size)
+    return left, top, max(min_size, right - left), max(min_size, bottom - top)
+
+
+def _sync_hover_with_selection(item: QtWidgets.QGraphicsItem, selected: bool) -> None:
+    item.setAcceptHoverEvents(selected)
+    if not selected:
+        item.unsetCursor()
+
+
+def _build_handle_rects(width: float, height: float, size: float) -> List[QtCore.QRectF]:
+    half = size / 2.0
+    mid_x = max(0.0, width / 2.0 - half)
+    mid_y = max(0.0, height / 2.0 - half)
+    far_x = max(0.0, width - size)
+    far_y = max(0.0, height - size)
+    return [
+        QtCore.QRectF(0.0, 0.0, size, size),
+        QtCore.QRectF(mid_x, 0.0, size, size),
+        QtCore.QRectF(far_x, 0.0, size, size),
+        QtCore.QRectF(far_x, mid_y, size, size),
+        QtCore.QRectF(far_x, far_y, size, size),
+        QtCore.QRectF(mid_x, far_y, size, size),
+        QtCore.QRectF(0.0, far_y, size, size),
+        QtCore.QRectF(0.0, mid_y, size, size),
+    ]
 
 
 class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
@@ -31,87 +433,128 @@ class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
         on_geometry_changed,
         on_snap_request,
         on_snap_finished,
+        image_key: Optional[bytes] = None,
     ):
         super().__init__()
         self.element_id = element.id
+        self.image_key = image_key
         self._on_geometry_changed = on_geometry_changed
         self._on_snap_request = on_snap_request
         self._on_snap_finished = on_snap_finished
+        self._snap_throttle = _SnapThrottle()
+        self._applying_snap = False
+        self._geometry_gate = _GeometryGate()
+        self._handle_cache: List[QtCore.QRectF] = []
+        self._handle_cache_wh: Optional[Tuple[float, float]] = None
         self._source_pixmap = pixmap
+        self._last_scaled_key: Optional[tuple] = None
+        # On-canvas size in pixels; the pixmap may be a pixel short of it
+        # while a resize drag is in progress.
+        self._size: Tuple[int, int] = (0, 0)
+        self._transform_mode = QtCore.Qt.SmoothTransformation
         self._resizing = False
+        # Set once a drag passes the start distance; see _enter_fast_paint.
+        self._fast_paint = False
         self._active_handle: Optional[str] = None
+        self._delta_mask: Optional[Tuple[int, int, int, int]] = None
         self._initial_rect: Optional[QtCore.QRectF] = None
         self._initial_mouse_scene: Optional[QtCore.QPointF] = None
         self.setAcceptedMouseButtons(QtCore.Qt.LeftButton)
-        self.setAcceptHoverEvents(True)
+        # Handles only exist while selected; hover tracking follows selection.
+        self.setAcceptHoverEvents(False)
         self.setFlags(
             QtWidgets.QGraphicsItem.ItemIsSelectable
             | QtWidgets.QGraphicsItem.ItemIsMovable
             | QtWidgets.QGraphicsItem.ItemSendsGeometryChanges
         )
         self.setTransformationMode(QtCore.Qt.SmoothTransformation)
+        # Pans and moves reuse the rasterised item; setPixmap invalidates it.
+        self.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
         self.apply_model_geometry(element)
 
     def apply_model_geometry(self, element: ImageElement) -> None:
-        width = max(self.MIN_SIZE, int(element.rect.width))
-        height = max(self.MIN_SIZE, int(element.rect.height))
-        scaled = self._source_pixmap.scaled(
-            width,
-            height,
-            QtCore.Qt.IgnoreAspectRatio,
-            QtCore.Qt.SmoothTransformation,
-        )
-        self.setPixmap(scaled)
-        self.setPos(element.rect.x, element.rect.y)
-        self.setOpacity(element.opacity)
+        self.set_size(element.rect.width, element.rect.height)
+        # Echoes from the property panel usually carry the current values.
+        pos = self.pos()
+        if pos.x() != element.rect.x or pos.y() != element.rect.y:
+            _set_model_pos(self, element.rect.x, element.rect.y)
+        if self.opacity() != element.opacity:
+            self.setOpacity(element.opacity)
+
+    def set_source_pixmap(self, pixmap: QtGui.QPixmap) -> None:
+        """Swap in a new source image, keeping the current on-canvas size."""
 
-    def set_size(self, width: float, height: float) -> None:
+        self._source_pixmap = pixmap
+        self._last_scaled_key = None
+        self.set_size(*self._size)
+
+    def set_size(
+        self,
+        width: float,
+        height: float,
+        mode: Optional[QtCore.Qt.TransformationMode] = None,
+    ) -> None:
+        if mode is None:
+            mode = self._transform_mode
         width = max(self.MIN_SIZE, int(width))
         height = max(self.MIN_SIZE, int(height))
-        scaled = self._source_pixmap.scaled(
-            width,
-            height,
-            QtCore.Qt.IgnoreAspectRatio,
-            QtCore.Qt.SmoothTransformation,
-        )
-        self.setPixmap(scaled)
-        self.setOpacity(self.opacity())  # keep current opacity
+        if (width, height) != self._size:
+            self.prepareGeometryChange()
+            self._size = (width, height)
+        if self._resizing:
+            # Collapse sub-pixel jitter during a drag into fewer cache buckets;
+            # only the preview pixmap is rounded, never the geometry.
+            width -= width % 2
+            height -= height % 2
+        key = (width, height, mode)
+        if key == self._last_scaled_key:
+            return
+        self._last_scaled_key = key
+        self.setPixmap(self._scaled_pixmap(width, height, mode))
+
+    def boundingRect(self) -> QtCore.QRectF:
+        return QtCore.QRectF(0.0, 0.0, float(self._size[0]), float(self._size[1]))
+
+    def _scaled_pixmap(self, width: int, height: int, mode: QtCore.Qt.TransformationMode) -> QtGui.QPixmap:
+        # Keyed by the source pixmap so items sharing an image share results.
+        quality = "fast" if mode == QtCore.Qt.FastTransformation else "smooth"
+        key = f"img:{self._source_pixmap.cacheKey()}:{width}x{height}:{quality}"
+        scaled = QtGui.QPixmap()
+        if not QtGui.QPixmapCache.find(key, scaled):
+            scaled = self._source_pixmap.scaled(
+                width,
+                height,
+                QtCore.Qt.IgnoreAspectRatio,
+                mode,
+            )
+            QtGui.QPixmapCache.insert(key, scaled)
+        return scaled
 
     def _emit_geometry_changed(self) -> None:
         if not self._on_geometry_changed:
             return
-        geo = self.pixmap().rect()
         pos = self.pos()
         self._on_geometry_changed(
             self.element_id,
             float(pos.x()),
             float(pos.y()),
-            float(geo.width()),
-            float(geo.height()),
+            float(self._size[0]),
+            float(self._size[1]),
         )
 
-    def _handle_rects(self) -> Dict[str, QtCore.QRectF]:
-        pix_rect = self.pixmap().rect()
-        w = float(pix_rect.width())
-        h = float(pix_rect.height())
-        s = float(self.HANDLE_SIZE)
-        half = s / 2.0
-        return {
-            "top-left": QtCore.QRectF(0.0, 0.0, s, s),
-            "top": QtCore.QRectF(max(0.0, w / 2.0 - half), 0.0, s, s),
-            "top-right": QtCore.QRectF(max(0.0, w - s), 0.0, s, s),
-            "right": QtCore.QRectF(max(0.0, w - s), max(0.0, h / 2.0 - half), s, s),
-            "bottom-right": QtCore.QRectF(max(0.0, w - s), max(0.0, h - s), s, s),
-            "bottom": QtCore.QRectF(max(0.0, w / 2.0 - half), max(0.0, h - s), s, s),
-            "bottom-left": QtCore.QRectF(0.0, max(0.0, h - s), s, s),
-            "left": QtCore.QRectF(0.0, max(0.0, h / 2.0 - half), s, s),
-        }
+    def _handle_size(self) -> Tuple[float, float]:
+        return float(self._size[0]), float(self._size[1])
+
+    def _handle_rects(self) -> List[QtCore.QRectF]:
+        size = self._handle_size()
+        if size != self._handle_cache_wh:
+            self._handle_cache = _build_handle_rects(size[0], size[1], float(self.HANDLE_SIZE))
+            self._handle_cache_wh = size
+        return self._handle_cache
 
     def _hit_handle(self, pos: QtCore.QPointF) -> Optional[str]:
-        for name, rect in self._handle_rects().items():
-            if rect.contains(pos):
-                return name
-        return None
+        width, height = self._handle_size()
+        return _hit_handle_at(pos, width, height, float(self.HANDLE_SIZE))
 
     def _update_cursor(self, pos: QtCore.QPointF) -> None:
         handle = self._hit_handle(pos)
@@ -129,16 +572,35 @@ class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
         self.unsetCursor()
         super().hoverLeaveEvent(event)
 
+    def _enter_fast_paint(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        """Draw with nearest-neighbour filtering once the press becomes a drag.
+
+        Switching the mode invalidates the device cache, so plain clicks
+        must not toggle it.
+        """
+
+        if self._fast_paint:
+            return
+        moved = event.screenPos() - event.buttonDownScreenPos(QtCore.Qt.LeftButton)
+        if moved.manhattanLength() < QtWidgets.QApplication.startDragDistance():
+            return
+        self._fast_paint = True
+        self.setTransformationMode(QtCore.Qt.FastTransformation)
+
     def mousePressEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        self._geometry_gate.begin()
         handle = self._hit_handle(event.pos())
         if handle:
             self._resizing = True
             self._active_handle = handle
+            self._delta_mask = _HANDLE_DELTAS[handle]
+            # Nearest-neighbour scaling while dragging; smoothed on release.
+            self._transform_mode = QtCore.Qt.FastTransformation
             self._initial_rect = QtCore.QRectF(
                 self.pos().x(),
                 self.pos().y(),
-                float(self.pixmap().width()),
-                float(self.pixmap().height()),
+                float(self._size[0]),
+                float(self._size[1]),
             )
             self._initial_mouse_scene = QtCore.QPointF(event.scenePos())
             event.accept()
@@ -146,6 +608,7 @@ class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        self._enter_fast_paint(event)
         if self._resizing:
             if self._initial_mouse_scene is None:
                 return
@@ -156,46 +619,38 @@ class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        pending = self._geometry_gate.end()
         if self._resizing:
             self._resizing = False
             self._active_handle = None
+            self._delta_mask = None
             self._initial_rect = None
             self._initial_mouse_scene = None
+            self._transform_mode = QtCore.Qt.SmoothTransformation
+            # Re-render at the exact size the drag ended on.
+            self.set_size(*self._size)
             self._emit_geometry_changed()
+            pending = False
             event.accept()
+        if self._fast_paint:
+            self._fast_paint = False
+            self.setTransformationMode(QtCore.Qt.SmoothTransformation)
+        _flush_snap(self, *self._handle_size())
+        if pending:
+            self._emit_geometry_changed()
+        if self._on_snap_finished:
+            self._on_snap_finished()
         super().mouseReleaseEvent(event)
 
     def _resize_with_delta(self, delta: QtCore.QPointF) -> None:
-        if not self._initial_rect or not self._active_handle:
-            return
-        handle = self._active_handle
-        left = self._initial_rect.left()
-        right = self._initial_rect.right()
-        top = self._initial_rect.top()
-        bottom = self._initial_rect.bottom()
-
-        if "left" in handle:
-            new_left = left + delta.x()
-            max_left = right - self.MIN_SIZE
-            left = min(new_left, max_left)
-        if "right" in handle:
-            new_right = right + delta.x()
-            min_right = left + self.MIN_SIZE
-            right = max(new_right, min_right)
-        if "top" in handle:
-            new_top = top + delta.y()
-            max_top = bottom - self.MIN_SIZE
-            top = min(new_top, max_top)
-        if "bottom" in handle:
-            new_bottom = bottom + delta.y()
-            min_bottom = top + self.MIN_SIZE
-            bottom = max(new_bottom, min_bottom)
-
-        new_width = max(self.MIN_SIZE, right - left)
-        new_height = max(self.MIN_SIZE, bottom - top)
+        if not self._initial_rect or not self._delta_mask:
+            return
+        left, top, new_width, new_height = _resized_geometry(
+            self._initial_rect, self._delta_mask, delta, self.MIN_SIZE
+        )
         self.setPos(QtCore.QPointF(left, top))
         self.set_size(new_width, new_height)
-        self._emit_geometry_changed()
+        _notify_geometry(self)
 
     def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
         super().paint(painter, option, widget)
@@ -204,16 +659,19 @@ class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
             painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
             painter.setPen(QtGui.QPen(QtGui.QColor("#1e88e5"), 1.2))
             painter.setBrush(QtGui.QBrush(QtGui.QColor("#ffffff")))
-            for handle_rect in self._handle_rects().values():
-                painter.drawRect(handle_rect)
+            painter.drawRects(self._handle_rects())
             painter.restore()
 
     def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value):
-        if change == QtWidgets.QGraphicsItem.ItemPositionChange and self._on_snap_request:
+        if (
+            change == QtWidgets.QGraphicsItem.ItemPositionChange
+            and self._on_snap_request
+            and not self._applying_snap
+        ):
             pos: QtCore.QPointF = value
-            width = float(self.pixmap().width())
-            height = float(self.pixmap().height())
-            snapped_x, snapped_y = self._on_snap_request(
+            width, height = self._handle_size()
+            snapped_x, snapped_y = self._snap_throttle.snap(
+                self._on_snap_request,
                 self.element_id,
                 float(pos.x()),
                 float(pos.y()),
@@ -222,23 +680,11 @@ class ImageGraphicsItem(QtWidgets.QGraphicsPixmapItem):
             )
             return QtCore.QPointF(snapped_x, snapped_y)
         if change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
-            pos: QtCore.QPointF = value
-            geo = self.pixmap().rect()
-            if self._on_geometry_changed:
-                self._on_geometry_changed(
-                    self.element_id,
-                    float(pos.x()),
-                    float(pos.y()),
-                    float(geo.width()),
-                    float(geo.height()),
-                )
+            _notify_geometry(self)
+        if change == QtWidgets.QGraphicsItem.ItemSelectedHasChanged:
+            _sync_hover_with_selection(self, bool(value))
         return super().itemChange(change, value)
 
-    def mouseReleaseEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
-        if self._on_snap_finished:
-            self._on_snap_finished()
-        super().mouseReleaseEvent(event)
-
 
 class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
     """Resizable graphics item for text elements."""
@@ -260,22 +706,36 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
         self._on_geometry_changed = on_geometry_changed
         self._on_snap_request = on_snap_request
         self._on_snap_finished = on_snap_finished
+        self._snap_throttle = _SnapThrottle()
+        self._applying_snap = False
+        self._geometry_gate = _GeometryGate()
+        self._handle_cache: List[QtCore.QRectF] = []
+        self._handle_cache_wh: Optional[Tuple[float, float]] = None
         self._resizing = False
         self._active_handle: Optional[str] = None
+        self._delta_mask: Optional[Tuple[int, int, int, int]] = None
         self._initial_rect: Optional[QtCore.QRectF] = None
         self._initial_mouse_scene: Optional[QtCore.QPointF] = None
         self.text = element.text
         self.font_family = element.font_family
         self.font_size = element.font_size
         self.color = element.color
+        self._static_text: Optional[QtGui.QStaticText] = None
+        self._static_text_key: Optional[tuple] = None
+        self._font = QtGui.QFont()
+        self._font_key: Optional[Tuple[str, int]] = None
+        self._qcolor = QtGui.QColor()
+        self._color_key: Optional[str] = None
+        self._refresh_style()
         self.setAcceptedMouseButtons(QtCore.Qt.LeftButton)
-        self.setAcceptHoverEvents(True)
+        # Handles only exist while selected; hover tracking follows selection.
+        self.setAcceptHoverEvents(False)
         self.setFlags(
             QtWidgets.QGraphicsItem.ItemIsSelectable
             | QtWidgets.QGraphicsItem.ItemIsMovable
             | QtWidgets.QGraphicsItem.ItemSendsGeometryChanges
         )
-        self.setPos(element.rect.x, element.rect.y)
+        _set_model_pos(self, element.rect.x, element.rect.y)
         self.setOpacity(element.opacity)
 
     def apply_model_geometry(self, element: TextElement) -> None:
@@ -283,11 +743,13 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
         width = max(self.MIN_SIZE, element.rect.width)
         height = max(self.MIN_SIZE, element.rect.height)
         self.setRect(0, 0, width, height)
-        self.setPos(element.rect.x, element.rect.y)
+        _set_model_pos(self, element.rect.x, element.rect.y)
         self.text = element.text
         self.font_family = element.font_family
         self.font_size = element.font_size
         self.color = element.color
+        self._static_text_key = None
+        self._refresh_style()
         self.setOpacity(element.opacity)
 
     def set_content(self, text: str, font_family: str, font_size: float, color: str) -> None:
@@ -295,8 +757,31 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
         self.font_family = font_family
         self.font_size = font_size
         self.color = color
+        self._static_text_key = None
+        self._refresh_style()
         self.update()
 
+    def _refresh_style(self) -> None:
+        font_key = (self.font_family, max(1, int(self.font_size)))
+        if font_key != self._font_key:
+            self._font = QtGui.QFont(*font_key)
+            self._font_key = font_key
+        if self.color != self._color_key:
+            self._qcolor = QtGui.QColor(self.color)
+            self._color_key = self.color
+
+    def _prepared_text(self, painter: QtGui.QPainter, font: QtGui.QFont, width: float) -> QtGui.QStaticText:
+        key = (self.text, self.font_family, int(self.font_size), int(width))
+        if self._static_text is None or key != self._static_text_key:
+            # QStaticText only breaks lines on the Unicode line separator.
+            static_text = QtGui.QStaticText(self.text.replace("\n", "\u2028"))
+            static_text.setTextFormat(QtCore.Qt.PlainText)
+            static_text.setTextWidth(width)
+            static_text.prepare(painter.transform(), font)
+            self._static_text = static_text
+            self._static_text_key = key
+        return self._static_text
+
     def _emit_geometry_changed(self) -> None:
         if not self._on_geometry_changed:
             return
@@ -310,28 +795,20 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
             float(rect.height()),
         )
 
-    def _handle_rects(self) -> Dict[str, QtCore.QRectF]:
+    def _handle_size(self) -> Tuple[float, float]:
         rect = self.rect()
-        w = float(rect.width())
-        h = float(rect.height())
-        s = float(self.HANDLE_SIZE)
-        half = s / 2.0
-        return {
-            "top-left": QtCore.QRectF(0.0, 0.0, s, s),
-            "top": QtCore.QRectF(max(0.0, w / 2.0 - half), 0.0, s, s),
-            "top-right": QtCore.QRectF(max(0.0, w - s), 0.0, s, s),
-            "right": QtCore.QRectF(max(0.0, w - s), max(0.0, h / 2.0 - half), s, s),
-            "bottom-right": QtCore.QRectF(max(0.0, w - s), max(0.0, h - s), s, s),
-            "bottom": QtCore.QRectF(max(0.0, w / 2.0 - half), max(0.0, h - s), s, s),
-            "bottom-left": QtCore.QRectF(0.0, max(0.0, h - s), s, s),
-            "left": QtCore.QRectF(0.0, max(0.0, h / 2.0 - half), s, s),
-        }
+        return float(rect.width()), float(rect.height())
+
+    def _handle_rects(self) -> List[QtCore.QRectF]:
+        size = self._handle_size()
+        if size != self._handle_cache_wh:
+            self._handle_cache = _build_handle_rects(size[0], size[1], float(self.HANDLE_SIZE))
+            self._handle_cache_wh = size
+        return self._handle_cache
 
     def _hit_handle(self, pos: QtCore.QPointF) -> Optional[str]:
-        for name, rect in self._handle_rects().items():
-            if rect.contains(pos):
-                return name
-        return None
+        width, height = self._handle_size()
+        return _hit_handle_at(pos, width, height, float(self.HANDLE_SIZE))
 
     def _update_cursor(self, pos: QtCore.QPointF) -> None:
         handle = self._hit_handle(pos)
@@ -350,10 +827,12 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
         super().hoverLeaveEvent(event)
 
     def mousePressEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        self._geometry_gate.begin()
         handle = self._hit_handle(event.pos())
         if handle:
             self._resizing = True
             self._active_handle = handle
+            self._delta_mask = _HANDLE_DELTAS[handle]
             self._initial_rect = QtCore.QRectF(
                 self.pos().x(),
                 self.pos().y(),
@@ -374,37 +853,37 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        pending = self._geometry_gate.end()
         if self._resizing:
             self._resizing = False
             self._active_handle = None
+            self._delta_mask = None
             self._initial_rect = None
             self._initial_mouse_scene = None
+            # The last throttled snap of the drag must still be applied.
+            _flush_snap(self, *self._handle_size())
             self._emit_geometry_changed()
             if self._on_snap_finished:
                 self._on_snap_finished()
             event.accept()
             return
+        _flush_snap(self, float(self.rect().width()), float(self.rect().height()))
+        if pending:
+            self._emit_geometry_changed()
         if self._on_snap_finished:
             self._on_snap_finished()
         super().mouseReleaseEvent(event)
 
     def _resize_with_delta(self, delta: QtCore.QPointF) -> None:
-        if not self._initial_rect or not self._active_handle:
-            return
-        rect = QtCore.QRectF(self._initial_rect)
-        handle = self._active_handle
-        if "left" in handle:
-            rect.setLeft(min(rect.right() - self.MIN_SIZE, rect.left() + delta.x()))
-        if "right" in handle:
-            rect.setRight(max(rect.left() + self.MIN_SIZE, rect.right() + delta.x()))
-        if "top" in handle:
-            rect.setTop(min(rect.bottom() - self.MIN_SIZE, rect.top() + delta.y()))
-        if "bottom" in handle:
-            rect.setBottom(max(rect.top() + self.MIN_SIZE, rect.bottom() + delta.y()))
+        if not self._initial_rect or not self._delta_mask:
+            return
+        left, top, width, height = _resized_geometry(
+            self._initial_rect, self._delta_mask, delta, self.MIN_SIZE
+        )
         self.prepareGeometryChange()
-        self.setRect(0, 0, rect.width(), rect.height())
-        self.setPos(rect.left(), rect.top())
-        self._emit_geometry_changed()
+        self.setRect(0, 0, width, height)
+        self.setPos(left, top)
+        _notify_geometry(self)
 
     def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
         rect = self.rect()
@@ -416,11 +895,10 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
         painter.restore()
 
         painter.save()
-        font = QtGui.QFont(self.font_family, max(1, int(self.font_size)))
-        painter.setFont(font)
-        color = QtGui.QColor(self.color)
-        painter.setPen(color)
-        painter.drawText(rect, QtCore.Qt.TextWordWrap | QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, self.text)
+        painter.setFont(self._font)
+        painter.setPen(self._qcolor)
+        painter.setClipRect(rect, QtCore.Qt.IntersectClip)
+        painter.drawStaticText(rect.topLeft(), self._prepared_text(painter, self._font, rect.width()))
         painter.restore()
 
         if self.isSelected():
@@ -428,14 +906,18 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
             painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
             painter.setPen(QtGui.QPen(QtGui.QColor("#1e88e5"), 1.2))
             painter.setBrush(QtGui.QBrush(QtGui.QColor("#ffffff")))
-            for handle_rect in self._handle_rects().values():
-                painter.drawRect(handle_rect)
+            painter.drawRects(self._handle_rects())
             painter.restore()
 
     def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value):
-        if change == QtWidgets.QGraphicsItem.ItemPositionChange and self._on_snap_request:
+        if (
+            change == QtWidgets.QGraphicsItem.ItemPositionChange
+            and self._on_snap_request
+            and not self._applying_snap
+        ):
             pos: QtCore.QPointF = value
-            snapped_x, snapped_y = self._on_snap_request(
+            snapped_x, snapped_y = self._snap_throttle.snap(
+                self._on_snap_request,
                 self.element_id,
                 float(pos.x()),
                 float(pos.y()),
@@ -444,16 +926,60 @@ class TextGraphicsItem(QtWidgets.QGraphicsRectItem):
             )
             return QtCore.QPointF(snapped_x, snapped_y)
         if change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
-            self._emit_geometry_changed()
+            _notify_geometry(self)
+        if change == QtWidgets.QGraphicsItem.ItemSelectedHasChanged:
+            _sync_hover_with_selection(self, bool(value))
         return super().itemChange(change, value)
 
 
+class _PageGridItem(QtWidgets.QGraphicsItem):
+    """Draws the page grid as a single item, stroking only the exposed lines."""
+
+    STEP = 50
+
+    def __init__(self, width: float, height: float) -> None:
+        super().__init__()
+        self._rect = QtCore.QRectF(0.0, 0.0, width, height)
+        self._pen = QtGui.QPen(QtGui.QColor("#d0d0d0"))
+        self._pen.setStyle(QtCore.Qt.DotLine)
+        self._pen.setWidth(1)
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        self.setZValue(-0.5)
+
+    def boundingRect(self) -> QtCore.QRectF:
+        return self._rect
+
+    def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
+        exposed = option.exposedRect.intersected(self._rect)
+        if exposed.isEmpty():
+            return
+        step = self.STEP
+        width = int(self._rect.width())
+        height = int(self._rect.height())
+        first_x = max(step, (int(exposed.left()) // step) * step)
+        last_x = min(width - 1, int(exposed.right()))
+        first_y = max(step, (int(exposed.top()) // step) * step)
+        last_y = min(height - 1, int(exposed.bottom()))
+        lines = [QtCore.QLineF(x, 0, x, height) for x in range(first_x, last_x + 1, step)]
+        lines.extend(QtCore.QLineF(0, y, width, y) for y in range(first_y, last_y + 1, step))
+        if not lines:
+            return
+        painter.save()
+        painter.setPen(self._pen)
+        painter.drawLines(lines)
+        painter.restore()
+
+
 class PageCanvas(QtWidgets.QGraphicsView):
     """Displays a PDF page preview with editable elements."""
 
     selectionChanged = QtCore.Signal(list)
     elementGeometryEdited = QtCore.Signal(object)
 
+    # Below this many elements a linear item scan beats maintaining a BSP tree.
+    BSP_INDEX_THRESHOLD = 50
+
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None):
         super().__init__(parent)
         self.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.SmoothPixmapTransform)
@@ -467,80 +993,310 @@ class PageCanvas(QtWidgets.QGraphicsView):
 
         self._page_model: Optional[PageModel] = None
         self._element_items: Dict[str, ImageGraphicsItem] = {}
+        self._element_by_id: Dict[str, Element] = {}
+        self._element_order: Dict[str, int] = {}
+        self._last_selection_ids: frozenset[str] = frozenset()
+        self._pending_decodes: Dict[bytes, ImageDecodeRunnable] = {}
+        self._fit_pending = False
+        self._fitted_key: Optional[tuple] = None
+        self._snap_index = _SnapIndex()
         self._background_item: Optional[QtWidgets.QGraphicsPixmapItem] = None
-        self._guide_lines: list[QtWidgets.QGraphicsLineItem] = []
-        self._grid_lines: list[QtWidgets.QGraphicsLineItem] = []
+        # Guide lines are pooled per orientation and only hidden between drags.
+        self._guide_lines: Dict[str, list[QtWidgets.QGraphicsLineItem]] = {"v": [], "h": []}
+        self._shown_guides: list[tuple[str, float]] = []
+        self._guide_pen = QtGui.QPen(QtGui.QColor("#ff7043"))
+        self._guide_pen.setWidth(1)
+        self._guide_pen.setStyle(QtCore.Qt.DashLine)
+        self._grid_item: Optional[_PageGridItem] = None
         self._grid_visible = False
 
     def set_page(self, page: PageModel, pixmap: QtGui.QPixmap) -> None:
+        self._set_background(pixmap)
+        if page is self._page_model:
+            self.update_page(page)
+            return
+        # Keep the scene, background, guides and grid; only the items change.
         self._page_model = page
-        self._scene.clear()
-        self._element_items.clear()
-        self._background_item = self._scene.addPixmap(pixmap)
-        self._background_item.setZValue(-1)
+        self._clear_guides()
         self._scene.setSceneRect(0, 0, page.width, page.height)
-        self._rebuild_elements()
-        self.fitInView(self._scene.sceneRect(), QtCore.Qt.KeepAspectRatio)
+        if self._element_items.keys().isdisjoint(element.id for element in page.elements):
+            self._drop_element_items()
+            self._last_selection_ids = frozenset()
+            self._rebuild_elements()
+        else:
+            self._reconcile_elements(page)
+        self._schedule_fit_in_view()
         self._update_grid_lines()
 
+    def _set_background(self, pixmap: QtGui.QPixmap) -> None:
+        if self._background_item is None:
+            self._background_item = self._scene.addPixmap(pixmap)
+            self._background_item.setZValue(-1)
+            return
+        self._background_item.setPixmap(pixmap)
+        self._background_item.setPos(0, 0)
+
+    def _drop_element_items(self) -> None:
+        items = list(self._element_items.values())
+        self._element_items.clear()
+        self._element_by_id.clear()
+        self._element_order.clear()
+        for item in items:
+            self._scene.removeItem(item)
+
+    def _schedule_fit_in_view(self) -> None:
+        if self._fit_pending:
+            return
+        self._fit_pending = True
+        QtCore.QTimer.singleShot(0, self._deferred_fit_in_view)
+
+    def _deferred_fit_in_view(self) -> None:
+        self._fit_pending = False
+        scene_rect = self._scene.sceneRect()
+        viewport_size = self.viewport().size()
+        key = (scene_rect.width(), scene_rect.height(), viewport_size.width(), viewport_size.height())
+        if key == self._fitted_key:
+            return
+        self._fitted_key = key
+        self.fitInView(scene_rect, QtCore.Qt.KeepAspectRatio)
+
     def _rebuild_elements(self) -> None:
         if not self._page_model:
             return
-        for element in self._page_model.elements:
-            if isinstance(element, ImageElement):
-                pixmap = QtGui.QPixmap()
-                pixmap.loadFromData(element.image_bytes)
-                item = ImageGraphicsItem(
-                    element,
-                    pixmap,
-                    on_geometry_changed=self._handle_geometry_changed,
-                    on_snap_request=self._request_snap_position,
-                    on_snap_finished=self._clear_guides,
-                )
-                item.setVisible(element.visible)
-                item.setFlag(QtWidgets.QGraphicsItem.ItemIsMovable, not element.locked)
-                self._scene.addItem(item)
-                self._element_items[element.id] = item
-            elif isinstance(element, TextElement):
-                item = TextGraphicsItem(
-                    element,
-                    on_geometry_changed=self._handle_geometry_changed,
-                    on_snap_request=self._request_snap_position,
-                    on_snap_finished=self._clear_guides,
-                )
-                item.setVisible(element.visible)
-                item.setFlag(QtWidgets.QGraphicsItem.ItemIsMovable, not element.locked)
-                self._scene.addItem(item)
-                self._element_items[element.id] = item
+        self._snap_index = _SnapIndex(self._page_model.elements)
+        # Insert without indexing, then pick the index once the page is built.
+        self._scene.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+        self.setUpdatesEnabled(False)
+        self._scene.blockSignals(True)
+        try:
+            self._add_element_items()
+        finally:
+            self._scene.blockSignals(False)
+            self.setUpdatesEnabled(True)
+            if len(self._page_model.elements) >= self.BSP_INDEX_THRESHOLD:
+                self._scene.setBspTreeDepth(0)
+                self._scene.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+            # Scene change notifications were blocked; repaint everything once.
+            self._scene.update()
+
+    def _add_element_items(self) -> None:
+        for order, element in enumerate(self._page_model.elements):
+            self._element_by_id[element.id] = element
+            self._element_order[element.id] = order
+            item = self._create_item(element)
+            if item is None:
+                continue
+            item.setZValue(order)
+            self._scene.addItem(item)
+            self._element_items[element.id] = item
+
+    def _create_item(self, element: Element) -> Optional[QtWidgets.QGraphicsItem]:
+        if isinstance(element, ImageElement):
+            image_key = _image_key(element.image_bytes)
+            item = ImageGraphicsItem(
+                element,
+                self._pixmap_for_key(image_key, element.image_bytes),
+                on_geometry_changed=self._handle_geometry_changed,
+                on_snap_request=self._request_snap_position,
+                on_snap_finished=self._clear_guides,
+                image_key=image_key,
+            )
+        elif isinstance(element, TextElement):
+            item = TextGraphicsItem(
+                element,
+                on_geometry_changed=self._handle_geometry_changed,
+                on_snap_request=self._request_snap_position,
+                on_snap_finished=self._clear_guides,
+            )
+        else:
+            return None
+        item.setVisible(element.visible)
+        item.setFlag(QtWidgets.QGraphicsItem.ItemIsMovable, not element.locked)
+        return item
+
+    def _pixmap_for_key(self, image_key: bytes, data: bytes) -> QtGui.QPixmap:
+        pixmap = _cached_pixmap(image_key)
+        if pixmap is None:
+            pixmap = _placeholder_pixmap()
+            self._request_image_decode(image_key, data)
+        return pixmap
+
+    def preload_images(self, pages: Iterable[PageModel]) -> None:
+        """Start decoding the document's element images ahead of page switches."""
+
+        keys = set()
+        # Encoded size is a lower bound on the decoded one.
+        budget = _PIXMAP_CACHE_LIMIT_BYTES
+        for page in pages:
+            for element in page.elements:
+                if not isinstance(element, ImageElement):
+                    continue
+                key = _image_key(element.image_bytes)
+                if key in keys:
+                    continue
+                keys.add(key)
+                if _cached_pixmap(key) is None:
+                    self._request_image_decode(key, element.image_bytes)
+                # Decoding more than the cache holds would only evict earlier pages.
+                budget -= len(element.image_bytes)
+                if budget <= 0:
+                    return
+
+    def release_images(self) -> None:
+        """Forget decoded images of the previous document.
+
+        Call when another document replaces the current one; cached pixmaps
+        and digest memos otherwise keep its image bytes alive.
+        """
+        _release_images()
+
+    @property
+    def page_model(self) -> Optional[PageModel]:
+        return self._page_model
+
+    def update_page(self, page: PageModel) -> None:
+        """Reconcile the items of the current page with its element list.
+
+        Unlike ``set_page`` this keeps the background and every unchanged item,
+        so only added elements are built and only removed ones are dropped.
+        """
+        if page is not self._page_model:
+            return
+        self._reconcile_elements(page)
+
+    def add_element_items(self, elements: Iterable[Element]) -> None:
+        """Build items for elements just appended to the current page."""
+        if not self._page_model:
+            return
+        for element in elements:
+            if element.id in self._element_items:
+                continue
+            self._element_by_id[element.id] = element
+            self._snap_index.update(element)
+            item = self._create_item(element)
+            if item is None:
+                continue
+            self._scene.addItem(item)
+            self._element_items[element.id] = item
+        self._apply_element_order()
+        # Undo restores clones under the same ids, so re-emit the next selection.
+        self._last_selection_ids = frozenset()
+
+    def remove_element_items(self, element_ids: Iterable[str]) -> None:
+        """Drop the items of elements removed from the current page."""
+        for element_id in element_ids:
+            item = self._element_items.pop(element_id, None)
+            if item is not None:
+                self._scene.removeItem(item)
+            self._element_by_id.pop(element_id, None)
+            self._element_order.pop(element_id, None)
+            self._snap_index.remove(element_id)
+
+    def restack_elements(self) -> None:
+        """Reapply stacking after the current page's elements were reordered."""
+        if not self._page_model:
+            return
+        self._apply_element_order()
+        self._snap_index = _SnapIndex(self._page_model.elements)
+
+    def _apply_element_order(self) -> None:
+        self._element_order = {element.id: order for order, element in enumerate(self._page_model.elements)}
+        for element_id, order in self._element_order.items():
+            item = self._element_items.get(element_id)
+            if item is not None:
+                item.setZValue(order)
+
+    def _reconcile_elements(self, page: PageModel) -> None:
+        current_ids = {element.id for element in page.elements}
+        self.setUpdatesEnabled(False)
+        try:
+            for element_id in [key for key in self._element_items if key not in current_ids]:
+                self._scene.removeItem(self._element_items.pop(element_id))
+                self._element_by_id.pop(element_id, None)
+            for order, element in enumerate(page.elements):
+                item = self._element_items.get(element.id)
+                if item is None:
+                    item = self._create_item(element)
+                    if item is None:
+                        continue
+                    self._scene.addItem(item)
+                    self._element_items[element.id] = item
+                else:
+                    self._sync_item(item, element)
+                item.setZValue(order)
+                self._element_by_id[element.id] = element
+            self._element_order = {element.id: order for order, element in enumerate(page.elements)}
+        finally:
+            self.setUpdatesEnabled(True)
+        self._snap_index = _SnapIndex(page.elements)
+        # Undo restores clones under the same ids, so re-emit the next selection.
+        self._last_selection_ids = frozenset()
+
+    def _sync_item(self, item: QtWidgets.QGraphicsItem, element: Element) -> None:
+        previous = self._element_by_id.get(element.id)
+        if isinstance(item, ImageGraphicsItem) and isinstance(element, ImageElement):
+            if previous is None or getattr(previous, "image_bytes", None) is not element.image_bytes:
+                image_key = _image_key(element.image_bytes)
+                if image_key != item.image_key:
+                    item.image_key = image_key
+                    item.set_source_pixmap(self._pixmap_for_key(image_key, element.image_bytes))
+            item.apply_model_geometry(element)
+        elif isinstance(item, TextGraphicsItem) and isinstance(element, TextElement):
+            item.apply_model_geometry(element)
+        item.setVisible(element.visible)
+        item.setFlag(QtWidgets.QGraphicsItem.ItemIsMovable, not element.locked)
+
+    def _request_image_decode(self, key: bytes, data: bytes) -> None:
+        if key in self._pending_decodes:
+            return
+        job = ImageDecodeRunnable(key, data)
+        job.signals.decoded.connect(self._handle_image_decoded)
+        self._pending_decodes[key] = job
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _handle_image_decoded(self, key: bytes, image: QtGui.QImage) -> None:
+        self._pending_decodes.pop(key, None)
+        if image.isNull():
+            return
+        pixmap = QtGui.QPixmap.fromImage(image)
+        _store_pixmap(key, pixmap)
+        for item in self._element_items.values():
+            if isinstance(item, ImageGraphicsItem) and item.image_key == key:
+                item.set_source_pixmap(pixmap)
 
     def sync_from_model(self, element: Element) -> None:
         """Refresh an item's geometry after external edits."""
         item = self._element_items.get(element.id)
         if not item:
             return
+        self._snap_index.update(element)
         if isinstance(item, ImageGraphicsItem) and isinstance(element, ImageElement):
-            item.setPos(element.rect.x, element.rect.y)
-            item.set_size(element.rect.width, element.rect.height)
-            item.setOpacity(element.opacity)
+            item.apply_model_geometry(element)
         elif isinstance(item, TextGraphicsItem) and isinstance(element, TextElement):
             item.apply_model_geometry(element)
 
     def clear(self) -> None:
         self._scene.clear()
+        self._background_item = None
         self._element_items.clear()
+        self._element_by_id.clear()
+        self._element_order.clear()
+        self._last_selection_ids = frozenset()
+        self._snap_index = _SnapIndex()
         self._page_model = None
-        self._clear_guides()
-        self._grid_lines.clear()
+        self._reset_guides()
+        self._grid_item = None
         self.selectionChanged.emit([])
 
     def _handle_geometry_changed(self, element_id: str, x: float, y: float, width: float, height: float) -> None:
         if not self._page_model:
             return
-        element = self._page_model.find_element(element_id)
+        element = self._element_by_id.get(element_id)
         if not element:
             return
         element.move_to(x, y)
         element.resize(width, height)
+        self._snap_index.update(element)
         self.elementGeometryEdited.emit(element)
 
     def select_element(self, element_id: str) -> None:
@@ -565,14 +1321,16 @@ class PageCanvas(QtWidgets.QGraphicsView):
         if not self._page_model:
             self.selectionChanged.emit([])
             return
-        selected_ids = []
-        for item in self._scene.selectedItems():
-            if isinstance(item, ImageGraphicsItem):
-                selected_ids.append(item.element_id)
-        elements = []
-        for element in self._page_model.elements:
-            if element.id in selected_ids:
-                elements.append(element)
+        new_ids = frozenset(
+            item.element_id
+            for item in self._scene.selectedItems()
+            if isinstance(item, (ImageGraphicsItem, TextGraphicsItem))
+        )
+        if new_ids == self._last_selection_ids:
+            return
+        self._last_selection_ids = new_ids
+        selected_ids = sorted(new_ids, key=lambda element_id: self._element_order.get(element_id, 0))
+        elements = [self._element_by_id[element_id] for element_id in selected_ids if element_id in self._element_by_id]
         self.selectionChanged.emit(elements)
 
     def _request_snap_position(
@@ -626,101 +1384,92 @@ class PageCanvas(QtWidgets.QGraphicsView):
             y = page.height - height
             guides.append(("h", page.height))
 
-        for element in page.elements:
-            if element.id == element_id:
+        # The band covers targets within one extra threshold of the starting
+        # edges, which is where a single earlier snap can move them. Targets
+        # only reachable through a chain of snaps are not considered.
+        band = threshold * 2
+        for target, _order, _slot, other_id in self._snap_index.near_x((x, x + width), band):
+            if other_id == element_id:
                 continue
-            if hasattr(element, "visible") and not element.visible:
+            if abs(x - target) < threshold:
+                x = target
+                guides.append(("v", target))
+            elif abs((x + width) - target) < threshold:
+                x = target - width
+                guides.append(("v", target))
+        for target, _order, _slot, other_id in self._snap_index.near_y((y, y + height), band):
+            if other_id == element_id:
                 continue
-            # vertical matching
-            other_positions = [
-                element.rect.x,
-                element.rect.x + element.rect.width / 2,
-                element.rect.x + element.rect.width,
-            ]
-            for target in other_positions:
-                if abs(x - target) < threshold:
-                    x = target
-                    guides.append(("v", target))
-                elif abs((x + width) - target) < threshold:
-                    x = target - width
-                    guides.append(("v", target))
-            # horizontal matching
-            other_y_positions = [
-                element.rect.y,
-                element.rect.y + element.rect.height / 2,
-                element.rect.y + element.rect.height,
-            ]
-            for target in other_y_positions:
-                if abs(y - target) < threshold:
-                    y = target
-                    guides.append(("h", target))
-                elif abs((y + height) - target) < threshold:
-                    y = target - height
-                    guides.append(("h", target))
+            if abs(y - target) < threshold:
+                y = target
+                guides.append(("h", target))
+            elif abs((y + height) - target) < threshold:
+                y = target - height
+                guides.append(("h", target))
 
         return x, y, guides
 
     def _show_guides(self, guides: list[tuple[str, float]]) -> None:
-        self._clear_guides()
         if not self._page_model:
+            self._clear_guides()
             return
-        pen = QtGui.QPen(QtGui.QColor("#ff7043"))
-        pen.setWidth(1)
-        pen.setStyle(QtCore.Qt.DashLine)
+        if guides == self._shown_guides:
+            return
+        used = {"v": 0, "h": 0}
         for orientation, coord in guides:
+            pool = self._guide_lines[orientation]
+            index = used[orientation]
+            used[orientation] += 1
+            if index == len(pool):
+                line = self._scene.addLine(QtCore.QLineF(), self._guide_pen)
+                line.setZValue(999)
+                pool.append(line)
+            line = pool[index]
             if orientation == "v":
-                line = self._scene.addLine(
-                    coord,
-                    0,
-                    coord,
-                    self._page_model.height,
-                    pen,
-                )
+                line.setLine(coord, 0, coord, self._page_model.height)
             else:
-                line = self._scene.addLine(
-                    0,
-                    coord,
-                    self._page_model.width,
-                    coord,
-                    pen,
-                )
-            line.setZValue(999)
-            self._guide_lines.append(line)
+                line.setLine(0, coord, self._page_model.width, coord)
+            line.setVisible(True)
+        for orientation, pool in self._guide_lines.items():
+            for line in pool[used[orientation]:]:
+                line.setVisible(False)
+        self._shown_guides = list(guides)
 
     def _clear_guides(self) -> None:
-        for line in self._guide_lines:
-            self._scene.removeItem(line)
-        self._guide_lines.clear()
+        if not self._shown_guides:
+            return
+        for pool in self._guide_lines.values():
+            for line in pool:
+                line.setVisible(False)
+        self._shown_guides = []
+
+    def _reset_guides(self) -> None:
+        """Forget pooled guide items after the scene has deleted them."""
+
+        for pool in self._guide_lines.values():
+            pool.clear()
+        self._shown_guides = []
 
     def set_grid_visible(self, visible: bool) -> None:
         self._grid_visible = visible
         self._update_grid_lines()
 
     def _update_grid_lines(self) -> None:
-        for line in self._grid_lines:
-            self._scene.removeItem(line)
-        self._grid_lines.clear()
+        if self._grid_item is not None:
+            self._scene.removeItem(self._grid_item)
+            self._grid_item = None
         if not self._grid_visible or not self._page_model:
             return
-        pen = QtGui.QPen(QtGui.QColor("#d0d0d0"))
-        pen.setStyle(QtCore.Qt.DotLine)
-        pen.setWidth(1)
-        step = 50
-        width = int(self._page_model.width)
-        height = int(self._page_model.height)
-        for x in range(step, width, step):
-            line = self._scene.addLine(x, 0, x, height, pen)
-            line.setZValue(-0.5)
-            self._grid_lines.append(line)
-        for y in range(step, height, step):
-            line = self._scene.addLine(0, y, width, y, pen)
-            line.setZValue(-0.5)
-            self._grid_lines.append(line)
+        self._grid_item = _PageGridItem(self._page_model.width, self._page_model.height)
+        self._scene.addItem(self._grid_item)
 
     def update_element_visibility(self, element_id: str, visible: bool) -> None:
         item = self._element_items.get(element_id)
         if item:
             item.setVisible(visible)
+        element = self._element_by_id.get(element_id)
+        if element:
+            self._snap_index.update(element)
 
     def update_element_lock(self, element_id: str, locked: bool) -> None:
         item = self._element_items.get(element_id)
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import os
+import string
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass
+from importlib import metadata
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
-from qt_material import apply_stylesheet
 
 from ..document import (
     DocumentModel,
@@ -18,18 +24,413 @@ from ..document import (
     create_image_element,
     create_text_element,
 )
-from ..pdf_io import PdfExporter, PdfImporter, PagePreview
+from ..pdf_io import LazyPreviewCache, PdfExporter, PdfImporter
+from ..workers import (
+    THUMBNAIL_PRESCALE_SIZES,
+    CachePruneRunnable,
+    ExportRunnable,
+    LoadRunnable,
+    PagePrefetchRunnable,
+    ThumbnailRunnable,
+    decode_scaled,
+    prescale_thumbnail,
+    thumbnail_box,
+)
 from .canvas import PageCanvas
 from .property_panel import PropertyPanel
 
+# Theme name that disables qt-material and the custom stylesheet entirely.
+NO_THEME = "none"
+
+THEME_CACHE_DIR = Path.home() / ".cache" / "pdf_editor"
+# Rendered page-list thumbnails, reused when the same PDF is reopened.
+THUMBNAIL_CACHE_DIR = THEME_CACHE_DIR / "thumbs"
+THUMBNAIL_CACHE_LIMIT_BYTES = 500 * 1024 * 1024
+# Autosave copies are written next to the theme cache.
+AUTOSAVE_DIR = THEME_CACHE_DIR
+
+# Marks page-list rows whose thumbnail has been rendered.
+THUMBNAIL_LOADED_ROLE = QtCore.Qt.UserRole + 1
+# Rows above and below the viewport whose thumbnails are loaded in advance.
+THUMBNAIL_BUFFER_ROWS = 5
+# Oldest undo entries are dropped beyond this many.
+HISTORY_LIMIT = 200
+
+# Looked up once here rather than per row when the layer panel is rebuilt.
+_USER_ROLE = QtCore.Qt.UserRole
+_CHECKED = QtCore.Qt.Checked
+_UNCHECKED = QtCore.Qt.Unchecked
+LAYER_ITEM_FLAGS = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsUserCheckable
+
+# Colours of the custom stylesheet drawn over qt-material; treat as read-only.
+LIGHT_PALETTE: Dict[str, str] = {
+    "surface": "#f6f8fb",
+    "panel": "#ffffff",
+    "card": "#ffffff",
+    "border": "#d8e0ea",
+    "hover": "#eef3fb",
+    "accent": "#2d6cdf",
+    "accent_soft": "#dfe9fb",
+    "accent_hover": "#1f5fc4",
+    "text": "#1f2933",
+    "muted_text": "#516076",
+    "canvas_bg": "#eef2f7",
+    "selection": "#e5edfa",
+}
+DARK_PALETTE: Dict[str, str] = {
+    "surface": "#0f172a",
+    "panel": "#0b1326",
+    "card": "#0e1a2f",
+    "border": "#1f2a44",
+    "hover": "#15233a",
+    "accent": "#5ab3f5",
+    "accent_soft": "#12314f",
+    "accent_hover": "#74c3ff",
+    "text": "#e4edf7",
+    "muted_text": "#9fb2c8",
+    "canvas_bg": "#0a101e",
+    "selection": "#1f3a5f",
+}
+
+# (keys, description) rows of the F1 shortcut overlay.
+SHORTCUTS: Tuple[Tuple[str, str], ...] = (
+    ("Ctrl+O", "PDFを開く"),
+    ("Ctrl+S / Ctrl+Shift+S", "保存 / 名前を付けて保存"),
+    ("Ctrl+I", "画像を挿入"),
+    ("Ctrl+D", "選択要素を複製"),
+    ("Delete", "選択要素を削除"),
+    ("Ctrl+Z / Ctrl+Shift+Z", "元に戻す / やり直す"),
+    ("Ctrl+Shift+N", "ページ追加"),
+    ("Ctrl+PgUp / Ctrl+PgDn", "ページ移動 (上/下)"),
+    ("F1", "ショートカット一覧を表示"),
+    ("Ctrl+Mouse Wheel", "ズーム"),
+)
+
+# Custom styling drawn over qt-material; placeholders are palette keys.
+_OVERRIDE_QSS = string.Template(
+    """
+    /* Modern surface overrides */
+    QWidget {
+        color: $text;
+        font-family: "Inter", "Noto Sans", "Segoe UI", sans-serif;
+        font-size: 11pt;
+    }
+    QMainWindow {
+        background: $surface;
+    }
+    QFrame#SidePanel {
+        background: $panel;
+        border: 1px solid $border;
+        border-radius: 14px;
+    }
+    QFrame#Card {
+        background: $card;
+        border: 1px solid $border;
+        border-radius: 12px;
+    }
+    QLabel#CardTitle {
+        font-size: 10pt;
+        font-weight: 600;
+        color: $muted_text;
+        padding-bottom: 2px;
+    }
+    QLabel#FieldLabel {
+        color: $muted_text;
+        font-size: 9.5pt;
+        padding-top: 2px;
+    }
+    QLabel#ThumbnailValueLabel {
+        color: $muted_text;
+    }
+    QGraphicsView#PageCanvas {
+        background: $canvas_bg;
+        border: 1px solid $border;
+        border-radius: 14px;
+    }
+    QLineEdit,
+    QPlainTextEdit,
+    QSpinBox,
+    QDoubleSpinBox,
+    QComboBox {
+        background: $surface;
+        color: $text;
+        border: 1px solid $border;
+        border-radius: 8px;
+        padding: 8px 10px;
+    }
+    QPlainTextEdit {
+        padding: 10px;
+    }
+    QLineEdit:focus,
+    QPlainTextEdit:focus,
+    QSpinBox:focus,
+    QDoubleSpinBox:focus,
+    QComboBox:focus {
+        border: 1px solid $accent;
+    }
+    QListWidget#PageList {
+        background: $card;
+        border: 1px solid $border;
+        border-radius: 12px;
+        padding: 6px;
+    }
+    QListWidget#PageList::item {
+        background: transparent;
+        margin: 2px;
+        padding: 10px 8px;
+        border-radius: 10px;
+    }
+    QListWidget#PageList::item:selected {
+        background: $accent_soft;
+        border: 1px solid $accent;
+        color: $text;
+    }
+    QListWidget#PageList::item:hover {
+        background: $hover;
+    }
+    QToolBar {
+        background: $panel;
+        border: 1px solid $border;
+        padding: 6px;
+        spacing: 8px;
+    }
+    QToolBar QToolButton {
+        padding: 6px 10px;
+        border-radius: 10px;
+    }
+    QToolBar QToolButton:hover {
+        background: $hover;
+    }
+    QToolBar QToolButton:checked {
+        background: $accent_soft;
+        border: 1px solid $accent;
+    }
+    QStatusBar {
+        background: $panel;
+        border-top: 1px solid $border;
+        color: $muted_text;
+    }
+    QDockWidget {
+        background: $panel;
+        border: 1px solid $border;
+    }
+    QDockWidget::title {
+        padding: 8px 10px;
+        background: $panel;
+        color: $muted_text;
+        border-bottom: 1px solid $border;
+    }
+    QTabWidget::pane {
+        border: 1px solid $border;
+        border-radius: 10px;
+        background: $card;
+    }
+    QTabBar::tab {
+        background: $panel;
+        color: $muted_text;
+        padding: 8px 14px;
+        border-top-left-radius: 10px;
+        border-top-right-radius: 10px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background: $card;
+        color: $text;
+        border: 1px solid $border;
+        border-bottom: 1px solid $card;
+    }
+    QTreeWidget {
+        background: $card;
+        border: 1px solid $border;
+        border-radius: 10px;
+    }
+    QTreeWidget::item:selected {
+        background: $accent_soft;
+        color: $text;
+    }
+    QSlider::groove:horizontal {
+        background: $border;
+        height: 6px;
+        border-radius: 4px;
+    }
+    QSlider::handle:horizontal {
+        background: $accent;
+        width: 16px;
+        margin: -6px 0;
+        border-radius: 8px;
+    }
+    QPushButton {
+        background: $accent;
+        color: #ffffff;
+        border-radius: 10px;
+        padding: 8px 14px;
+        border: none;
+    }
+    QPushButton:hover {
+        background: $accent_hover;
+    }
+    QPushButton:disabled {
+        background: $border;
+        color: $muted_text;
+    }
+    QMenuBar {
+        background: $panel;
+        border: none;
+    }
+    QMenuBar::item:selected {
+        background: $hover;
+    }
+    QMenu {
+        background: $card;
+        border: 1px solid $border;
+    }
+    QMenu::item:selected {
+        background: $accent_soft;
+    }
+    """
+)
+
+# Standard icons keyed by style and pixmap; several actions share the same one.
+_STD_ICON_CACHE: Dict[Tuple[int, QtWidgets.QStyle.StandardPixmap], QtGui.QIcon] = {}
+
+
+def _std_icon(style: QtWidgets.QStyle, pixmap: QtWidgets.QStyle.StandardPixmap) -> QtGui.QIcon:
+    key = (id(style), pixmap)
+    icon = _STD_ICON_CACHE.get(key)
+    if icon is None:
+        icon = _STD_ICON_CACHE[key] = style.standardIcon(pixmap)
+    return icon
+
+
+@functools.lru_cache(maxsize=64)
+def _qcolor(name: str) -> QtGui.QColor:
+    """Parsed theme colour; shared, so callers must not modify it."""
+
+    return QtGui.QColor(name)
+
+
+# Fill and dotted border of blank pages and placeholder thumbnails.
+_BLANK_FILL = QtGui.QColor("#ffffff")
+_BLANK_BORDER_PEN = QtGui.QPen(QtGui.QColor("#c5c5c5"), 2, QtCore.Qt.DotLine)
+
+
+@functools.lru_cache(maxsize=256)
+def _fit_image_to_page(
+    page_width: float, page_height: float, image_width: int, image_height: int
+) -> Tuple[float, float, float, float]:
+    """Return ``(x, y, width, height)`` for an image centred at most 60% page width."""
+
+    width = min(image_width, page_width * 0.6)
+    height = max(1, image_height * width / max(1, image_width))
+    return max(0.0, (page_width - width) / 2), max(0.0, (page_height - height) / 2), width, height
+
+
+def _document_fingerprint(document: DocumentModel) -> bytes:
+    """Digest of everything the exporter writes, used to skip no-op autosaves."""
 
-@dataclass
+    digest = hashlib.blake2b(str(document.source_path).encode("utf-8"), digest_size=16)
+    for page in document.pages:
+        digest.update(repr((page.uid, page.width, page.height, page.rotation, page.source_index)).encode("utf-8"))
+        for element in page.elements:
+            rect = element.rect
+            state = (element.id, rect.x, rect.y, rect.width, rect.height, element.opacity, element.visible)
+            if isinstance(element, TextElement):
+                state += (element.text, element.font_size, element.color)
+            else:
+                # Image payloads never change on an existing element; hashing
+                # megabytes of pixels on every tick is what this avoids.
+                state += (len(element.image_bytes),)
+            digest.update(repr(state).encode("utf-8"))
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_material_fonts() -> None:
+    """Register qt-material's Roboto fonts once per process."""
+
+    from qt_material import add_fonts
+
+    add_fonts()
+
+
+def _restore_material_state(text_color: str) -> None:
+    """Redo what qt-material's apply_stylesheet does besides setting the QSS.
+
+    Cached stylesheets skip apply_stylesheet, but they still expect Roboto to
+    be registered and the palette Text colour to match the theme.
+    """
+
+    try:
+        _load_material_fonts()
+    except Exception:  # pylint: disable=broad-except
+        pass
+    palette = QtGui.QGuiApplication.palette()
+    palette.setColor(QtGui.QPalette.Text, QtGui.QColor(text_color))
+    QtGui.QGuiApplication.setPalette(palette)
+
+
+@dataclass(slots=True, frozen=True)
 class HistoryCommand:
     action: str  # "insert" or "delete"
     page_id: str
     element: Element
 
 
+class PageImageStore:
+    """LRU of decoded page backgrounds keyed by page uid.
+
+    Evicted pages are simply decoded again from the preview cache (or redrawn
+    as blank pages) the next time they are shown.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._images: "OrderedDict[str, QtGui.QImage]" = OrderedDict()
+
+    def __contains__(self, page_uid: str) -> bool:
+        return page_uid in self._images
+
+    def get(self, page_uid: str) -> Optional[QtGui.QImage]:
+        image = self._images.get(page_uid)
+        if image is not None:
+            self._images.move_to_end(page_uid)
+        return image
+
+    def put(self, page_uid: str, image: QtGui.QImage) -> None:
+        self._images[page_uid] = image
+        self._images.move_to_end(page_uid)
+        while len(self._images) > self.maxsize:
+            self._images.popitem(last=False)
+
+    def pop(self, page_uid: str) -> Optional[QtGui.QImage]:
+        return self._images.pop(page_uid, None)
+
+    def clear(self) -> None:
+        self._images.clear()
+
+
+class ShortcutTableModel(QtCore.QAbstractTableModel):
+    """Read-only view of ``SHORTCUTS`` for the shortcut overlay."""
+
+    _HEADERS = ("キー", "説明")
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(SHORTCUTS)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._HEADERS)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or not index.isValid():
+            return None
+        return SHORTCUTS[index.row()][index.column()]
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or orientation != QtCore.Qt.Horizontal:
+            return None
+        return self._HEADERS[section]
+
+
 class SettingsDialog(QtWidgets.QDialog):
     def __init__(
         self,
@@ -148,38 +549,125 @@ class MainWindow(QtWidgets.QMainWindow):
             "light_cyan.xml",
             "dark_pink.xml",
             "light_cyan_500.xml",
+            NO_THEME,
         ]
         theme_pref = self.settings.value("theme", None)
         env_theme = os.getenv("PDF_EDITOR_THEME")
         self.current_theme = theme_pref or env_theme or "dark_teal.xml"
         self._palette = self._palette_for_theme(self.current_theme)
+        # Theme whose stylesheet is currently installed on the application.
+        self._applied_theme: Optional[str] = None
+        # Complete application stylesheet and qt-material icon search paths per
+        # theme, so switching back to a theme skips building it again.
+        self._theme_stylesheets: Dict[str, Tuple[str, List[str], str]] = {}
 
         self.thumbnail_size = int(self.settings.value("thumbnail_size", 110))
         self.default_page_width = float(self.settings.value("default_page_width", 595.0))
         self.default_page_height = float(self.settings.value("default_page_height", 842.0))
+        # Values as last read from or written to QSettings.
+        self._settings_values: Dict[str, object] = {
+            "theme": theme_pref,
+            "thumbnail_size": self.thumbnail_size,
+            "default_page_width": self.default_page_width,
+            "default_page_height": self.default_page_height,
+        }
 
         self.document: Optional[DocumentModel] = None
-        self.page_pixmaps: Dict[str, QtGui.QPixmap] = {}
+        self.page_previews: Optional[LazyPreviewCache] = None
+        # Decoded page backgrounds; only the page on the canvas holds a QPixmap.
+        self.page_images = PageImageStore()
+        self._current_page_pixmap: Optional[Tuple[str, QtGui.QPixmap]] = None
+        self._prefetch_job: Optional[PagePrefetchRunnable] = None
         self.current_page_index: Optional[int] = None
         self._selected_element: Optional[ImageElement] = None
         self._selected_elements: List[Element] = []
         self._layer_panel_updating = False
+        self._layer_items: Dict[str, QtWidgets.QTreeWidgetItem] = {}
+        # Inserted image payloads by content digest, so the same file inserted
+        # again shares one bytes object.
+        self._image_bytes_by_digest: Dict[bytes, bytes] = {}
+        # Metrics of the insertion font by point size, used to size new text boxes.
+        self._font_metrics: Dict[int, QtGui.QFontMetrics] = {}
         self.current_tool = "select"
-        self.undo_stack: List[HistoryCommand] = []
-        self.redo_stack: List[HistoryCommand] = []
+        self.undo_stack: Deque[HistoryCommand] = deque(maxlen=HISTORY_LIMIT)
+        self.redo_stack: Deque[HistoryCommand] = deque(maxlen=HISTORY_LIMIT)
+        # While positive, history pushes leave the undo/redo actions to _bulk_mutation.
+        self._bulk_depth = 0
         self.page_filter_text = ""
         self._page_metadata_updating = False
         self._unsaved_changes = False
+        # Edits not yet written by an autosave or a save.
+        self._autosave_pending = False
+        # Set when an autosave tick landed mid-edit and waits for the user to pause.
+        self._autosave_deferred = False
+        self._export_job: Optional[ExportRunnable] = None
+        self._autosave_job: Optional[ExportRunnable] = None
+        # AUTOSAVE_DIR is created on the first autosave, not on every tick.
+        self._autosave_dir_ready = False
+        # Fingerprint of the last autosaved state and of the one being written.
+        self._autosave_fingerprint: Optional[bytes] = None
+        self._autosave_job_fingerprint: Optional[bytes] = None
+        self._load_job: Optional[LoadRunnable] = None
+        self._export_progress: Optional[QtWidgets.QProgressDialog] = None
+        # Built on the first F1 press and reused afterwards.
+        self._shortcut_dialog: Optional[QtWidgets.QDialog] = None
+        # Built on the first right-click on the canvas and reused afterwards.
+        self._canvas_menu: Optional[QtWidgets.QMenu] = None
+        # Enabled flags last applied by _update_page_actions.
+        self._page_action_state: Optional[Tuple[bool, bool, bool, bool]] = None
+        self._thumbnail_generation = 0
+        # Queued jobs are kept alive here until they report back.
+        self._thumbnail_jobs: Dict[Tuple[int, str], ThumbnailRunnable] = {}
+        self._page_list_items: Dict[str, QtWidgets.QListWidgetItem] = {}
+        # Row of each page in page_list; filtering hides rows but never moves them.
+        self._page_row_by_uid: Dict[str, int] = {}
+        # (page uid, lowercased label) in page order, for filtering rows.
+        self._page_filter_keys: List[Tuple[str, str]] = []
+        # Stat-based version key of the opened PDF (path, size, mtime); keys
+        # thumbnails across reopens of an unchanged file.
+        self._doc_key: Optional[str] = None
+        # Filter keystrokes and slider ticks only repopulate the list once settled.
+        self._filter_debounce = QtCore.QTimer(self)
+        self._filter_debounce.setSingleShot(True)
+        self._filter_debounce.setInterval(150)
+        self._filter_debounce.timeout.connect(self._apply_page_filter)
+        self._thumbnail_resize_debounce = QtCore.QTimer(self)
+        self._thumbnail_resize_debounce.setSingleShot(True)
+        self._thumbnail_resize_debounce.setInterval(60)
+        self._thumbnail_resize_debounce.timeout.connect(self._apply_thumbnail_size)
+        # Note keystrokes are written to the page once typing pauses.
+        self._note_commit_timer = QtCore.QTimer(self)
+        self._note_commit_timer.setSingleShot(True)
+        self._note_commit_timer.setInterval(200)
+        self._note_commit_timer.timeout.connect(self._commit_page_note)
+        self._note_page_uid: Optional[str] = None
+        # Property-panel edits refresh the status bar at most once per frame.
+        self._status_refresh_timer = QtCore.QTimer(self)
+        self._status_refresh_timer.setSingleShot(True)
+        self._status_refresh_timer.setInterval(16)
+        self._status_refresh_timer.timeout.connect(self._update_status_labels)
 
         self.setWindowTitle("PDF Editor")
         self.resize(1280, 820)
 
         self._build_ui()
-        self._apply_theme(self.current_theme)
+        # Styling is applied once the event loop runs so the window paints first;
+        # until then the canvas already uses the theme's background colour.
+        if self.current_theme != NO_THEME:
+            self.canvas.setBackgroundBrush(_qcolor(self._palette["canvas_bg"]))
+        QtCore.QTimer.singleShot(0, lambda: self._apply_theme(self.current_theme))
         self.autosave_timer = QtCore.QTimer(self)
         self.autosave_timer.setInterval(120000)
         self.autosave_timer.timeout.connect(self._handle_autosave_timeout)
         self.autosave_timer.start()
+        # Restarted by every edit; while it runs the user is still editing.
+        self._autosave_idle_timer = QtCore.QTimer(self)
+        self._autosave_idle_timer.setSingleShot(True)
+        self._autosave_idle_timer.setInterval(5000)
+        self._autosave_idle_timer.timeout.connect(self._handle_autosave_idle)
+        QtCore.QThreadPool.globalInstance().start(
+            CachePruneRunnable(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_LIMIT_BYTES)
+        )
 
     def _build_ui(self) -> None:
         self._create_actions()
@@ -189,8 +677,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.page_list.setObjectName("PageList")
         self.page_list.setSpacing(8)
         self.page_list.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        # Lay rows out in batches so long documents do not stall the first paint.
+        self.page_list.setLayoutMode(QtWidgets.QListView.Batched)
         self.page_list.currentRowChanged.connect(self._handle_page_change)
-        self.page_list.setIconSize(QtCore.QSize(self.thumbnail_size, int(self.thumbnail_size * 1.4)))
+        # Every row has the same icon box, so rows need not be measured one by one.
+        self.page_list.setUniformItemSizes(True)
+        self.page_list.setIconSize(self._thumbnail_icon_size())
+        self.page_list.verticalScrollBar().valueChanged.connect(self._load_visible_thumbnails)
+        self.page_list.verticalScrollBar().rangeChanged.connect(self._load_visible_thumbnails)
 
         self.page_search = QtWidgets.QLineEdit()
         self.page_search.setPlaceholderText("ページ番号でジャンプ")
@@ -240,7 +734,6 @@ class MainWindow(QtWidgets.QMainWindow):
         nav_layout.addLayout(slider_layout)
         nav_layout.addWidget(self.page_zoom_slider)
         nav_layout.addWidget(self.page_filter_input)
-        page_layout.addWidget(nav_card)
 
         list_card, list_layout = self._create_card("ページ一覧")
         controls_layout = QtWidgets.QHBoxLayout()
@@ -479,19 +972,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings_action.triggered.connect(self._open_settings_dialog)
 
         style = self.style()
-        self.open_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_DialogOpenButton))
-        self.save_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_DialogSaveButton))
-        self.insert_image_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_FileIcon))
-        self.delete_element_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_TrashIcon))
-        self.duplicate_element_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_FileDialogNewFolder))
-        self.undo_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowBack))
-        self.redo_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowForward))
-        self.add_page_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_FileDialogNewFolder))
-        self.remove_page_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_DialogCancelButton))
-        self.move_page_up_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowUp))
-        self.move_page_down_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowDown))
-        self.bring_forward_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowUp))
-        self.send_backward_action.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowDown))
+        self.open_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_DialogOpenButton))
+        self.save_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_DialogSaveButton))
+        self.insert_image_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_FileIcon))
+        self.delete_element_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_TrashIcon))
+        self.duplicate_element_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_FileDialogNewFolder))
+        self.undo_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_ArrowBack))
+        self.redo_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_ArrowForward))
+        self.add_page_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_FileDialogNewFolder))
+        self.remove_page_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_DialogCancelButton))
+        self.move_page_up_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_ArrowUp))
+        self.move_page_down_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_ArrowDown))
+        self.bring_forward_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_ArrowUp))
+        self.send_backward_action.setIcon(_std_icon(style, QtWidgets.QStyle.SP_ArrowDown))
 
     def _create_menu(self) -> None:
         file_menu = self.menuBar().addMenu("ファイル")
@@ -567,14 +1060,35 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         file_path = file_dialog.selectedFiles()[0]
         path = Path(file_path)
-        try:
-            document, previews = self.importer.load(path)
-        except RuntimeError as exc:
-            QtWidgets.QMessageBox.critical(self, "読み込みエラー", str(exc))
-            return
-
+        # Parsing and hashing a large PDF must not stall the event loop.
+        job = LoadRunnable(self.importer, path)
+        job.signals.loaded.connect(self._handle_pdf_loaded)
+        job.signals.failed.connect(self._handle_pdf_load_failed)
+        self._load_job = job
+        self.open_action.setEnabled(False)
+        self.statusBar().showMessage(f"{path.name} を読み込んでいます...")
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _handle_pdf_load_failed(self, message: str) -> None:
+        self._load_job = None
+        self.open_action.setEnabled(True)
+        self.statusBar().clearMessage()
+        QtWidgets.QMessageBox.critical(self, "読み込みエラー", message)
+
+    def _handle_pdf_loaded(self, document: DocumentModel, previews: LazyPreviewCache, doc_key: Optional[str]) -> None:
+        path = document.source_path
+        self._load_job = None
+        self.open_action.setEnabled(True)
+        if self.page_previews:
+            self.page_previews.close()
         self.document = document
-        self.page_pixmaps = self._build_pixmaps(previews)
+        self.page_previews = previews
+        self._doc_key = doc_key
+        self.page_images.clear()
+        self._current_page_pixmap = None
+        self._image_bytes_by_digest.clear()
+        self.canvas.release_images()
+        self.canvas.preload_images(document.pages)
         self._populate_page_list()
         self.save_action.setEnabled(True)
         self.insert_image_action.setEnabled(True)
@@ -597,44 +1111,188 @@ class MainWindow(QtWidgets.QMainWindow):
             self._update_status_labels()
             self._update_page_metadata_fields()
 
-    def _build_pixmaps(self, previews: List[PagePreview]) -> Dict[str, QtGui.QPixmap]:
-        pixmaps: Dict[str, QtGui.QPixmap] = {}
-        for preview in previews:
-            pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(preview.image_bytes, "PNG")
-            pixmaps[preview.page_id] = pixmap
-        return pixmaps
-
     def _populate_page_list(self) -> None:
-        self.page_list.clear()
-        if not self.document:
-            return
-        filter_text = self.page_filter_text or ""
-        filter_text_lower = filter_text.lower()
+        # Results from jobs queued for the previous list are ignored.
+        self._thumbnail_generation += 1
+        self._page_list_items.clear()
+        self._page_row_by_uid.clear()
+        self._page_filter_keys = []
+        # Rebuild without a relayout, repaint or row signal per inserted item.
+        self.page_list.setUpdatesEnabled(False)
+        self.page_list.blockSignals(True)
+        try:
+            self.page_list.clear()
+            if self.document:
+                self._add_page_rows()
+        finally:
+            self.page_list.blockSignals(False)
+            self.page_list.setUpdatesEnabled(True)
+        if self.document:
+            self._filter_page_rows()
+
+    def _add_page_rows(self) -> None:
+        largest = thumbnail_box(max(THUMBNAIL_PRESCALE_SIZES))
+        placeholder = QtGui.QIcon(self._create_blank_pixmap(largest.width(), largest.height()))
         for index, page in enumerate(self.document.pages):
-            if filter_text_lower and filter_text_lower not in page.label.lower():
-                continue
-            pixmap = self._get_page_pixmap(page)
-            icon = QtGui.QIcon(
-                pixmap.scaled(
-                    self.thumbnail_size,
-                    int(self.thumbnail_size * 1.4),
-                    QtCore.Qt.KeepAspectRatio,
-                    QtCore.Qt.SmoothTransformation,
-                )
-            )
-            label = f"Page {index + 1}"
-            if page.label:
-                label += f": {page.label}"
-            item = QtWidgets.QListWidgetItem(icon, label)
+            self._page_filter_keys.append((page.uid, page.label.lower()))
+            # Thumbnails are rendered once the row scrolls into view.
+            item = QtWidgets.QListWidgetItem(placeholder, self._page_row_text(index, page))
             item.setData(QtCore.Qt.UserRole, page.uid)
             if page.note:
                 item.setToolTip(page.note)
             self.page_list.addItem(item)
-        if self.page_list.count() == 0:
+            self._page_list_items[page.uid] = item
+            self._page_row_by_uid[page.uid] = index
+
+    def _filter_page_rows(self) -> None:
+        """Hide rows whose label does not match the filter.
+
+        Rows and their loaded thumbnails are kept, so changing the filter
+        never rebuilds the list.
+        """
+        filter_text_lower = (self.page_filter_text or "").lower()
+        visible = 0
+        for page_uid, label_lower in self._page_filter_keys:
+            item = self._page_list_items.get(page_uid)
+            if item is None:
+                continue
+            hidden = bool(filter_text_lower) and filter_text_lower not in label_lower
+            if item.isHidden() != hidden:
+                item.setHidden(hidden)
+            if not hidden:
+                visible += 1
+        current_item = self.page_list.currentItem()
+        if current_item is not None and current_item.isHidden():
+            # The canvas keeps the page; only the list loses its current row.
+            self.page_list.blockSignals(True)
+            self.page_list.setCurrentRow(-1)
+            self.page_list.blockSignals(False)
+        if visible == 0:
             self._handle_page_change(-1)
         elif self.current_page_index is not None:
             self._select_page_row(self.current_page_index)
+        QtCore.QTimer.singleShot(0, self._load_visible_thumbnails)
+
+    @staticmethod
+    def _page_row_text(index: int, page: PageModel) -> str:
+        label = f"Page {index + 1}"
+        if page.label:
+            label += f": {page.label}"
+        return label
+
+    def _load_visible_thumbnails(self, *_args) -> None:
+        if not self.document:
+            return
+        count = self.page_list.count()
+        if not count:
+            return
+        first, last = self._visible_page_rows()
+        for row in range(max(0, first - THUMBNAIL_BUFFER_ROWS), min(count, last + THUMBNAIL_BUFFER_ROWS + 1)):
+            item = self.page_list.item(row)
+            if not item or item.isHidden() or item.data(THUMBNAIL_LOADED_ROLE):
+                continue
+            page = self.document.find_page_by_id(item.data(QtCore.Qt.UserRole))
+            if not page:
+                continue
+            item.setData(THUMBNAIL_LOADED_ROLE, True)
+            cache_key = self._thumbnail_cache_key(page)
+            cached = self._find_thumbnail_icon(cache_key) if cache_key else None
+            if cached is not None:
+                item.setIcon(cached)
+                continue
+            if self._start_thumbnail_job(page):
+                continue
+            images = prescale_thumbnail(self._get_thumbnail_image(page))
+            item.setIcon(self._thumbnail_icon(images, cache_key))
+
+    def _visible_page_rows(self) -> Tuple[int, int]:
+        viewport_rect = self.page_list.viewport().rect()
+        first = self._page_row_near(viewport_rect.top(), 1)
+        last = self._page_row_near(viewport_rect.bottom(), -1)
+        return (
+            first if first >= 0 else 0,
+            last if last >= 0 else self.page_list.count() - 1,
+        )
+
+    def _page_row_near(self, y: int, step: int) -> int:
+        # Probes can land in the spacing between rows; step inwards past it.
+        x = self.page_list.viewport().rect().center().x()
+        for offset in range(0, self.page_list.spacing() * 2 + 1, 4):
+            index = self.page_list.indexAt(QtCore.QPoint(x, y + step * offset))
+            if index.isValid():
+                return index.row()
+        return -1
+
+    def _thumbnail_cache_key(self, page: PageModel) -> Optional[str]:
+        if page.source_index is None:
+            # Inserted pages have no source render; their uid is stable instead.
+            return f"thumb:page:{page.uid}"
+        if not self._doc_key:
+            return None
+        return f"thumb:{self._doc_key}:{page.source_index}"
+
+    def _thumbnail_disk_path(self, page: PageModel) -> Optional[Path]:
+        # Only source pages of a keyed file have a key that survives reopening.
+        if not self._doc_key or page.source_index is None:
+            return None
+        key = self._thumbnail_cache_key(page)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return THUMBNAIL_CACHE_DIR / f"{digest}.png"
+
+    def _thumbnail_icon_size(self) -> QtCore.QSize:
+        return thumbnail_box(self.thumbnail_size)
+
+    @staticmethod
+    def _find_thumbnail_icon(cache_key: str) -> Optional[QtGui.QIcon]:
+        icon = QtGui.QIcon()
+        for width in THUMBNAIL_PRESCALE_SIZES:
+            pixmap = QtGui.QPixmap()
+            if not QtGui.QPixmapCache.find(f"{cache_key}:{width}", pixmap):
+                return None
+            icon.addPixmap(pixmap)
+        return icon
+
+    @staticmethod
+    def _thumbnail_icon(images: List[QtGui.QImage], cache_key: Optional[str]) -> QtGui.QIcon:
+        """Icon holding one pixmap per prescaled size; the view picks the closest."""
+
+        icon = QtGui.QIcon()
+        for width, image in zip(THUMBNAIL_PRESCALE_SIZES, images):
+            pixmap = QtGui.QPixmap.fromImage(image)
+            if cache_key:
+                QtGui.QPixmapCache.insert(f"{cache_key}:{width}", pixmap)
+            icon.addPixmap(pixmap)
+        return icon
+
+    def _start_thumbnail_job(self, page: PageModel) -> bool:
+        """Render a source page's thumbnail on the thread pool if possible."""
+
+        if page.source_index is None or not self.page_previews or self.page_previews.closed:
+            return False
+        if page.uid in self.page_images:
+            return False
+        job = ThumbnailRunnable(
+            self.page_previews,
+            page.source_index,
+            self._thumbnail_generation,
+            page.uid,
+            self._thumbnail_disk_path(page),
+        )
+        job.signals.ready.connect(self._handle_thumbnail_ready)
+        self._thumbnail_jobs[(self._thumbnail_generation, page.uid)] = job
+        QtCore.QThreadPool.globalInstance().start(job)
+        return True
+
+    def _handle_thumbnail_ready(self, generation: int, page_uid: str, images: List[QtGui.QImage]) -> None:
+        self._thumbnail_jobs.pop((generation, page_uid), None)
+        if generation != self._thumbnail_generation:
+            return
+        item = self._page_list_items.get(page_uid)
+        if item is None or not images:
+            return
+        page = self.document.find_page_by_id(page_uid) if self.document else None
+        cache_key = self._thumbnail_cache_key(page) if page else None
+        item.setIcon(self._thumbnail_icon(images, cache_key))
 
     def _handle_page_change(self, index: int) -> None:
         if not self.document or index < 0:
@@ -651,6 +1309,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self._update_status_labels()
             if hasattr(self, "layer_tree"):
                 self.layer_tree.clear()
+                self._layer_items.clear()
             self._update_page_metadata_fields()
             return
         item = self.page_list.item(index)
@@ -665,6 +1324,7 @@ class MainWindow(QtWidgets.QMainWindow):
         pixmap = self._get_page_pixmap(page)
         self.property_panel.set_page_size(page.width, page.height)
         self.canvas.set_page(page, pixmap)
+        self._prefetch_neighbour_pages(page_index)
         self.property_panel.set_element(None)
         self._selected_element = None
         self._selected_elements = []
@@ -688,17 +1348,20 @@ class MainWindow(QtWidgets.QMainWindow):
         if not file_path:
             return
         path = Path(file_path)
-        data = path.read_bytes()
-        pixmap = QtGui.QPixmap()
-        if not pixmap.loadFromData(data):
+        data = self._shared_image_bytes(path.read_bytes())
+        # Only the header is needed for sizing; the canvas decodes the image
+        # on the thread pool.
+        buffer = QtCore.QBuffer()
+        buffer.setData(QtCore.QByteArray(data))
+        reader = QtGui.QImageReader(buffer)
+        image_size = reader.size() if reader.canRead() else QtCore.QSize()
+        if not image_size.isValid():
             QtWidgets.QMessageBox.warning(self, "画像エラー", "画像を読み込めませんでした。")
             return
         page = self.document.get_page(self.current_page_index)
-        target_width = min(pixmap.width(), page.width * 0.6)
-        scale = target_width / max(1, pixmap.width())
-        target_height = max(1, pixmap.height() * scale)
-        x = max(0.0, (page.width - target_width) / 2)
-        y = max(0.0, (page.height - target_height) / 2)
+        x, y, target_width, target_height = _fit_image_to_page(
+            page.width, page.height, image_size.width(), image_size.height()
+        )
 
         element = create_image_element(
             x=x,
@@ -711,7 +1374,11 @@ class MainWindow(QtWidgets.QMainWindow):
         page.add_element(element)
         self._push_history("insert", page.uid, element)
         self._mark_unsaved()
-        self._refresh_canvas([element.id])
+        self._refresh_canvas_incremental(added=[element], select_element_ids=[element.id])
+
+    def _shared_image_bytes(self, data: bytes) -> bytes:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        return self._image_bytes_by_digest.setdefault(digest, data)
 
     def _trigger_image_insertion(self) -> None:
         if not self.insert_image_action.isEnabled():
@@ -731,11 +1398,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if not text:
             return
         font_size = values["font_size"]
-        font = QtGui.QFont("Noto Sans", int(font_size))
-        metrics = QtGui.QFontMetrics(font)
-        lines = text.splitlines() or [" "]
-        width = max(metrics.horizontalAdvance(line) for line in lines) + 20
-        height = metrics.lineSpacing() * len(lines) + 20
+        # Qt measures every line of the text in one call.
+        text_size = self._text_metrics(int(font_size)).boundingRect(
+            0, 0, 10**6, 10**6, QtCore.Qt.TextExpandTabs, text
+        ).size()
+        width = text_size.width() + 20
+        height = text_size.height() + 20
         page = self.document.get_page(self.current_page_index)
         width = min(width, page.width * 0.9)
         height = min(height, page.height * 0.9)
@@ -753,7 +1421,13 @@ class MainWindow(QtWidgets.QMainWindow):
         page.add_element(element)
         self._push_history("insert", page.uid, element)
         self._mark_unsaved()
-        self._refresh_canvas([element.id])
+        self._refresh_canvas_incremental(added=[element], select_element_ids=[element.id])
+
+    def _text_metrics(self, point_size: int) -> QtGui.QFontMetrics:
+        metrics = self._font_metrics.get(point_size)
+        if metrics is None:
+            metrics = self._font_metrics[point_size] = QtGui.QFontMetrics(QtGui.QFont("Noto Sans", point_size))
+        return metrics
 
     def _set_tool_mode(self, mode: str) -> None:
         self.current_tool = mode
@@ -763,18 +1437,15 @@ class MainWindow(QtWidgets.QMainWindow):
         if mode == "image":
             if not self.document or self.current_page_index is None:
                 QtWidgets.QMessageBox.information(self, "画像挿入", "画像を挿入するにはページを開いてください。")
-                self.select_tool_action.setChecked(True)
-                self.current_tool = "select"
+                self._return_to_select_tool()
                 return
             self.statusBar().showMessage("画像挿入モード: 画像ファイルを選択してください。", 3000)
             self._insert_image()
-            self.select_tool_action.setChecked(True)
-            self.current_tool = "select"
+            self._return_to_select_tool()
             return
         if mode == "text":
             self._insert_text()
-            self.select_tool_action.setChecked(True)
-            self.current_tool = "select"
+            self._return_to_select_tool()
             return
         if mode == "shape":
             QtWidgets.QMessageBox.information(
@@ -782,12 +1453,19 @@ class MainWindow(QtWidgets.QMainWindow):
                 "ツール",
                 "このツールは次のアップデートで提供予定です。現在は選択モードをご利用ください。",
             )
+            self._return_to_select_tool()
+
+    def _return_to_select_tool(self) -> None:
+        # The action group unchecks the others; re-checking is only needed
+        # when another tool is still shown as active.
+        if not self.select_tool_action.isChecked():
             self.select_tool_action.setChecked(True)
-            self.current_tool = "select"
+        self.current_tool = "select"
 
     def _export_pdf(self) -> None:
-        if not self.document:
+        if not self.document or self._export_job:
             return
+        self._flush_page_note()
         target_path, _ = QtWidgets.QFileDialog.getSaveFileName(
             self,
             "編集済み PDF を保存",
@@ -796,34 +1474,106 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         if not target_path:
             return
-        try:
-            self.exporter.export(self.document, Path(target_path))
-        except RuntimeError as exc:
-            QtWidgets.QMessageBox.critical(self, "保存エラー", str(exc))
-            return
+        snapshot = self.document.snapshot()
+        job = ExportRunnable(self.exporter, snapshot, Path(target_path))
+        job.signals.progress.connect(self._handle_export_progress)
+        job.signals.finished.connect(self._handle_export_finished)
+        job.signals.failed.connect(self._handle_export_failed)
+        job.signals.cancelled.connect(self._handle_export_cancelled)
+
+        dialog = QtWidgets.QProgressDialog("PDF を保存しています...", "キャンセル", 0, snapshot.page_count, self)
+        dialog.setWindowTitle("保存")
+        dialog.setWindowModality(QtCore.Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(job.cancel)
+        dialog.show()
+
+        self._export_job = job
+        self._export_progress = dialog
+        self.save_action.setEnabled(False)
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _handle_export_progress(self, done: int, total: int) -> None:
+        if self._export_progress:
+            self._export_progress.setMaximum(total)
+            self._export_progress.setValue(done)
+
+    def _handle_export_finished(self, target_path: str) -> None:
+        self._finish_export_job()
         self.statusBar().showMessage(f"{target_path} に保存しました。")
         self._unsaved_changes = False
+        self._autosave_pending = False
         self.autosave_status_label.setText("AutoSave: 保存済み")
 
+    def _handle_export_failed(self, message: str) -> None:
+        self._finish_export_job()
+        QtWidgets.QMessageBox.critical(self, "保存エラー", message)
+
+    def _handle_export_cancelled(self) -> None:
+        self._finish_export_job()
+        self.statusBar().showMessage("保存をキャンセルしました。", 3000)
+
+    def _finish_export_job(self) -> None:
+        self._export_job = None
+        if self._export_progress:
+            self._export_progress.close()
+            self._export_progress.deleteLater()
+            self._export_progress = None
+        self.save_action.setEnabled(self.document is not None)
+
     def _refresh_canvas(self, select_element_ids: Optional[List[str]] = None) -> None:
         if not self.document or self.current_page_index is None:
             return
         page = self.document.get_page(self.current_page_index)
-        pixmap = self._get_page_pixmap(page)
-        self.canvas.set_page(page, pixmap)
+        if self.canvas.page_model is page:
+            self.canvas.update_page(page)
+        else:
+            pixmap = self._get_page_pixmap(page)
+            self.canvas.set_page(page, pixmap)
         self._rebuild_layer_panel()
         if select_element_ids:
             self.canvas.select_elements(select_element_ids)
         else:
             self.canvas.select_elements([])
 
+    def _refresh_canvas_incremental(
+        self,
+        added: Sequence[Element] = (),
+        removed: Sequence[str] = (),
+        restacked: bool = False,
+        select_element_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Update the canvas and layer panel for elements changed on the current page.
+
+        Only the affected items and rows are touched; a page that is not on the
+        canvas yet falls back to ``_refresh_canvas``.
+        """
+
+        if not self.document or self.current_page_index is None:
+            return
+        page = self.document.get_page(self.current_page_index)
+        if self.canvas.page_model is not page:
+            self._refresh_canvas(select_element_ids)
+            return
+        if removed:
+            self.canvas.remove_element_items(removed)
+        if added:
+            self.canvas.add_element_items(added)
+        if restacked:
+            self.canvas.restack_elements()
+        self._update_layer_rows(page, added, removed, restacked)
+        self.canvas.select_elements(select_element_ids or [])
+
     def _handle_selection_changed(self, elements: List[Element]) -> None:
-        self._selected_elements = elements
-        self._selected_element = elements[0] if elements else None
+        # The panel flushes pending edits on switch; they apply to the old selection.
         if elements:
             self.property_panel.set_element(elements[0])
         else:
             self.property_panel.set_element(None)
+        self._selected_elements = elements
+        self._selected_element = elements[0] if elements else None
         self._update_selection_actions()
         self._update_status_labels()
         self._sync_layer_selection()
@@ -841,19 +1591,23 @@ class MainWindow(QtWidgets.QMainWindow):
         element = self._selected_element
         if not element:
             return
+        rect = element.rect
+        if (rect.x, rect.y, rect.width, rect.height) == (x, y, width, height):
+            return
         element.move_to(x, y)
         element.resize(width, height)
         self.canvas.sync_from_model(element)
-        self._selected_element = element
-        self._update_status_labels()
+        self._status_refresh_timer.start()
         self._mark_unsaved()
 
     def _handle_property_opacity_changed(self, opacity: float) -> None:
         if not self.document or self.current_page_index is None or not self._selected_element:
             return
+        if self._selected_element.opacity == opacity:
+            return
         self._selected_element.opacity = opacity
         self.canvas.sync_from_model(self._selected_element)
-        self._update_status_labels()
+        self._status_refresh_timer.start()
         self._mark_unsaved()
 
     def _delete_selected_element(self) -> None:
@@ -869,18 +1623,20 @@ class MainWindow(QtWidgets.QMainWindow):
             if reply != QtWidgets.QMessageBox.Yes:
                 return
         page = self.document.get_page(self.current_page_index)
-        removed_any = False
-        for element in list(self._selected_elements):
-            removed = page.remove_element(element.id)
-            if removed:
-                self._push_history("delete", page.uid, removed)
-                removed_any = True
-        if removed_any:
-            self._selected_elements = []
-            self._selected_element = None
-            self.property_panel.set_element(None)
-            self._update_selection_actions()
-            self._refresh_canvas()
+        removed_ids: List[str] = []
+        with self._bulk_mutation():
+            for element in list(self._selected_elements):
+                removed = page.remove_element(element.id)
+                if removed:
+                    self._push_history("delete", page.uid, removed)
+                    removed_ids.append(removed.id)
+            if removed_ids:
+                self._selected_elements = []
+                self._selected_element = None
+                self.property_panel.set_element(None)
+                self._update_selection_actions()
+                self._refresh_canvas_incremental(removed=removed_ids)
+        if removed_ids:
             self._update_status_labels()
             self._mark_unsaved()
 
@@ -902,7 +1658,6 @@ class MainWindow(QtWidgets.QMainWindow):
 
         new_page = PageModel(width=width, height=height, rotation=0, source_index=None)
         self.document.insert_page(insert_index, new_page)
-        self.page_pixmaps[new_page.uid] = self._create_blank_pixmap(width, height)
 
         self._populate_page_list()
         self._select_page_row(insert_index)
@@ -926,7 +1681,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if reply != QtWidgets.QMessageBox.Yes:
             return
         removed_page = self.document.remove_page(self.current_page_index)
-        self.page_pixmaps.pop(removed_page.uid, None)
+        self.page_images.pop(removed_page.uid)
         new_index = min(self.current_page_index, self.document.page_count - 1)
         self._populate_page_list()
         if new_index >= 0:
@@ -944,8 +1699,7 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         idx = self.current_page_index
         self.document.pages[idx - 1], self.document.pages[idx] = self.document.pages[idx], self.document.pages[idx - 1]
-        self._populate_page_list()
-        self._select_page_row(idx - 1)
+        self._swap_page_rows(idx - 1, idx - 1)
         self.statusBar().showMessage("ページを上に移動しました。", 3000)
         self._update_page_actions()
         self._update_status_labels()
@@ -960,62 +1714,97 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         idx = self.current_page_index
         self.document.pages[idx + 1], self.document.pages[idx] = self.document.pages[idx], self.document.pages[idx + 1]
-        self._populate_page_list()
-        self._select_page_row(idx + 1)
+        self._swap_page_rows(idx, idx + 1)
         self.statusBar().showMessage("ページを下に移動しました。", 3000)
         self._update_page_actions()
         self._update_status_labels()
         self._mark_unsaved()
 
+    def _swap_page_rows(self, row: int, current_index: int) -> None:
+        """Follow a swap of pages ``row`` and ``row + 1`` by moving one list row.
+
+        Both rows keep their items and loaded thumbnails; only their numbered
+        text changes. The current page stays on the canvas at ``current_index``.
+        """
+
+        if len(self._page_filter_keys) != self.document.page_count:
+            self._populate_page_list()
+            self._select_page_row(current_index)
+            return
+        self.page_list.blockSignals(True)
+        try:
+            moved = self.page_list.item(row + 1)
+            # Hidden state lives in the view and does not survive takeItem.
+            hidden = moved.isHidden()
+            self.page_list.insertItem(row, self.page_list.takeItem(row + 1))
+            moved.setHidden(hidden)
+            for index in (row, row + 1):
+                page = self.document.get_page(index)
+                self._page_list_items[page.uid].setText(self._page_row_text(index, page))
+                self._page_row_by_uid[page.uid] = index
+                self._page_filter_keys[index] = (page.uid, page.label.lower())
+            self.current_page_index = current_index
+            item = self._page_list_items[self.document.get_page(current_index).uid]
+            self.page_list.setCurrentRow(-1 if item.isHidden() else current_index)
+        finally:
+            self.page_list.blockSignals(False)
+
     def _duplicate_selected_element(self) -> None:
         if not self.document or self.current_page_index is None or not self._selected_elements:
             return
         page = self.document.get_page(self.current_page_index)
-        new_ids: List[str] = []
+        new_elements: List[Element] = []
         offset = 20
-        for index, element in enumerate(self._selected_elements):
-            x = min(page.width - element.rect.width, element.rect.x + offset * (index + 1))
-            y = min(page.height - element.rect.height, element.rect.y + offset * (index + 1))
-            if isinstance(element, ImageElement):
-                new_element = create_image_element(
-                    x=x,
-                    y=y,
-                    width=element.rect.width,
-                    height=element.rect.height,
-                    source_path=element.source_path,
-                    image_bytes=element.image_bytes,
-                )
-                new_element.opacity = element.opacity
-            elif isinstance(element, TextElement):
-                new_element = create_text_element(
-                    x=x,
-                    y=y,
-                    width=element.rect.width,
-                    height=element.rect.height,
-                    text=element.text,
-                    font_family=element.font_family,
-                    font_size=element.font_size,
-                    color=element.color,
+        with self._bulk_mutation():
+            for index, element in enumerate(self._selected_elements):
+                x = min(page.width - element.rect.width, element.rect.x + offset * (index + 1))
+                y = min(page.height - element.rect.height, element.rect.y + offset * (index + 1))
+                if isinstance(element, ImageElement):
+                    new_element = create_image_element(
+                        x=x,
+                        y=y,
+                        width=element.rect.width,
+                        height=element.rect.height,
+                        source_path=element.source_path,
+                        image_bytes=element.image_bytes,
+                    )
+                    new_element.opacity = element.opacity
+                elif isinstance(element, TextElement):
+                    new_element = create_text_element(
+                        x=x,
+                        y=y,
+                        width=element.rect.width,
+                        height=element.rect.height,
+                        text=element.text,
+                        font_family=element.font_family,
+                        font_size=element.font_size,
+                        color=element.color,
+                    )
+                    new_element.opacity = element.opacity
+                else:
+                    continue
+                page.add_element(new_element)
+                self._push_history("insert", page.uid, new_element)
+                new_elements.append(new_element)
+            if new_elements:
+                self._refresh_canvas_incremental(
+                    added=new_elements,
+                    select_element_ids=[element.id for element in new_elements],
                 )
-                new_element.opacity = element.opacity
-            else:
-                continue
-            page.add_element(new_element)
-            self._push_history("insert", page.uid, new_element)
-            new_ids.append(new_element.id)
-        if new_ids:
+        if new_elements:
             self.statusBar().showMessage("要素を複製しました。", 2000)
-            self._refresh_canvas(new_ids)
             self._mark_unsaved()
 
     def _bring_selected_to_front(self) -> None:
         if not self.document or self.current_page_index is None or not self._selected_elements:
             return
         page = self.document.get_page(self.current_page_index)
-        for element in self._selected_elements:
-            page.elements = [elem for elem in page.elements if elem.id != element.id]
-            page.elements.append(element)
-        self._refresh_canvas([elem.id for elem in self._selected_elements])
+        kept, moved = self._partition_selected(page)
+        page.elements = kept + moved
+        self._refresh_canvas_incremental(
+            restacked=True,
+            select_element_ids=[elem.id for elem in self._selected_elements],
+        )
         self.statusBar().showMessage("要素を前面に移動しました。", 2000)
         self._mark_unsaved()
 
@@ -1023,13 +1812,26 @@ class MainWindow(QtWidgets.QMainWindow):
         if not self.document or self.current_page_index is None or not self._selected_elements:
             return
         page = self.document.get_page(self.current_page_index)
-        for element in reversed(self._selected_elements):
-            page.elements = [elem for elem in page.elements if elem.id != element.id]
-            page.elements.insert(0, element)
-        self._refresh_canvas([elem.id for elem in self._selected_elements])
+        kept, moved = self._partition_selected(page)
+        page.elements = moved + kept
+        self._refresh_canvas_incremental(
+            restacked=True,
+            select_element_ids=[elem.id for elem in self._selected_elements],
+        )
         self.statusBar().showMessage("要素を背面に移動しました。", 2000)
         self._mark_unsaved()
 
+    def _partition_selected(self, page: PageModel) -> Tuple[List[Element], List[Element]]:
+        """Split the page's elements into unselected and selected, in one pass.
+
+        Selected elements keep the order in which they were selected.
+        """
+
+        selected = {element.id: element for element in self._selected_elements}
+        kept = [element for element in page.elements if element.id not in selected]
+        moved = [element for element_id, element in selected.items() if page.find_element(element_id) is element]
+        return kept, moved
+
     def _edit_selected_text(self) -> None:
         if not self._selected_element or not isinstance(self._selected_element, TextElement):
             return
@@ -1053,14 +1855,33 @@ class MainWindow(QtWidgets.QMainWindow):
         self._mark_unsaved()
 
     def _push_history(self, action: str, page_id: str, element: Element) -> None:
+        # An inserted element stays owned by the page, and undoing the insert
+        # only needs its id; redo re-adds a copy, so no clone is taken here.
+        # A deleted element must survive any later reuse of the object.
         command = HistoryCommand(
             action=action,
             page_id=page_id,
-            element=clone_element(element),
+            element=clone_element(element) if action == "delete" else element,
         )
         self.undo_stack.append(command)
         self.redo_stack.clear()
-        self._update_history_actions()
+        if not self._bulk_depth:
+            self._update_history_actions()
+
+    @contextmanager
+    def _bulk_mutation(self) -> Iterator[None]:
+        """Apply several element edits with one canvas repaint and one history update."""
+
+        self._bulk_depth += 1
+        if self._bulk_depth == 1:
+            self.canvas.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self.canvas.setUpdatesEnabled(True)
+                self._update_history_actions()
 
     def _undo(self) -> None:
         if not self.document or not self.undo_stack:
@@ -1084,49 +1905,43 @@ class MainWindow(QtWidgets.QMainWindow):
         page = self.document.find_page_by_id(command.page_id)
         if not page:
             return
-        element = clone_element(command.element)
-
-        if command.action == "insert":
-            if undo:
-                page.remove_element(element.id)
-                select_id: Optional[str] = None
-            else:
-                page.add_element(element)
-                select_id = element.id
-        elif command.action == "delete":
-            if undo:
-                page.add_element(element)
-                select_id = element.id
-            else:
-                page.remove_element(element.id)
-                select_id = None
-        else:
+        element_id = command.element.id
+        if command.action not in ("insert", "delete"):
             return
+        # Removal only needs the id; a copy is made only when the element
+        # goes back onto the page, so the stored one is never shared.
+        added: Optional[Element] = None
+        if (command.action == "insert") != undo:
+            added = clone_element(command.element)
+            page.add_element(added)
+        else:
+            page.remove_element(element_id)
 
         if (
             self.current_page_index is not None
             and self.document.get_page(self.current_page_index).uid == command.page_id
         ):
-            if select_id:
-                self._refresh_canvas([select_id])
+            if added is not None:
+                self._refresh_canvas_incremental(added=[added], select_element_ids=[element_id])
             else:
                 self._selected_element = None
                 self.property_panel.set_element(None)
-                self._refresh_canvas()
+                self._refresh_canvas_incremental(removed=[element_id])
 
     def _update_history_actions(self) -> None:
         self.undo_action.setEnabled(bool(self.undo_stack))
         self.redo_action.setEnabled(bool(self.redo_stack))
 
     def _handle_thumbnail_resize(self, value: int) -> None:
+        if value == self.thumbnail_size:
+            return
         self.thumbnail_size = value
         self.thumbnail_value_label.setText(f"{value}px")
-        self.page_list.setIconSize(QtCore.QSize(value, int(value * 1.4)))
-        if self.document:
-            current_index = self.current_page_index
-            self._populate_page_list()
-            if current_index is not None:
-                self._select_page_row(current_index)
+        self._thumbnail_resize_debounce.start()
+
+    def _apply_thumbnail_size(self) -> None:
+        # Row icons already hold every prescaled size, so only the view changes.
+        self.page_list.setIconSize(self._thumbnail_icon_size())
 
     def _handle_page_jump(self) -> None:
         text = self.page_search.text().strip()
@@ -1143,13 +1958,11 @@ class MainWindow(QtWidgets.QMainWindow):
         target_index = page_number - 1
         if target_index < 0 or target_index >= self.document.page_count:
             return
-        target_id = self.document.get_page(target_index).uid
-        for row in range(self.page_list.count()):
-            item = self.page_list.item(row)
-            if item and item.data(QtCore.Qt.UserRole) == target_id:
-                self.page_list.setCurrentRow(row)
-                self.statusBar().showMessage(f"ページ {page_number} へ移動", 2000)
-                return
+        item = self._page_list_items.get(self.document.get_page(target_index).uid)
+        if item is not None and not item.isHidden():
+            self.page_list.setCurrentItem(item)
+            self.statusBar().showMessage(f"ページ {page_number} へ移動", 2000)
+            return
         self.statusBar().showMessage("フィルターの条件によりページが表示されていません。", 3000)
 
     def _update_status_labels(self) -> None:
@@ -1185,33 +1998,88 @@ class MainWindow(QtWidgets.QMainWindow):
         if not self.layer_tree:
             return
         self._layer_panel_updating = True
-        self.layer_tree.clear()
-        if not self.document or self.current_page_index is None:
+        # Rows are built detached and inserted in one call, with a single
+        # repaint once the tree is complete.
+        self.layer_tree.setUpdatesEnabled(False)
+        self.layer_tree.blockSignals(True)
+        try:
+            self.layer_tree.clear()
+            self._layer_items.clear()
+            if not self.document or self.current_page_index is None:
+                return
+            page = self.document.get_page(self.current_page_index)
+            items: List[QtWidgets.QTreeWidgetItem] = []
+            for element in reversed(page.elements):
+                item = self._create_layer_item(element)
+                items.append(item)
+                self._layer_items[element.id] = item
+            self.layer_tree.addTopLevelItems(items)
+            self.layer_tree.resizeColumnToContents(0)
+        finally:
+            self.layer_tree.blockSignals(False)
+            self.layer_tree.setUpdatesEnabled(True)
+            self._layer_panel_updating = False
+        self._sync_layer_selection()
+
+    def _create_layer_item(self, element: Element) -> QtWidgets.QTreeWidgetItem:
+        item = QtWidgets.QTreeWidgetItem([self._layer_label(element), "", ""])
+        item.setData(0, _USER_ROLE, element.id)
+        item.setFlags(LAYER_ITEM_FLAGS)
+        item.setCheckState(1, _CHECKED if element.visible else _UNCHECKED)
+        item.setCheckState(2, _CHECKED if element.locked else _UNCHECKED)
+        return item
+
+    def _update_layer_rows(
+        self,
+        page: PageModel,
+        added: Sequence[Element],
+        removed: Sequence[str],
+        restacked: bool,
+    ) -> None:
+        """Apply element additions, removals and reordering to the layer tree in place."""
+
+        self._layer_panel_updating = True
+        self.layer_tree.setUpdatesEnabled(False)
+        self.layer_tree.blockSignals(True)
+        try:
+            root = self.layer_tree.invisibleRootItem()
+            for element_id in removed:
+                item = self._layer_items.pop(element_id, None)
+                if item is not None:
+                    root.removeChild(item)
+            # Appended elements are topmost, so their rows go first.
+            for element in added:
+                if element.id in self._layer_items:
+                    continue
+                item = self._create_layer_item(element)
+                self.layer_tree.insertTopLevelItem(0, item)
+                self._layer_items[element.id] = item
+            if restacked:
+                root.takeChildren()
+                self.layer_tree.addTopLevelItems(
+                    [
+                        self._layer_items[element.id]
+                        for element in reversed(page.elements)
+                        if element.id in self._layer_items
+                    ]
+                )
+            if added:
+                self.layer_tree.resizeColumnToContents(0)
+        finally:
+            self.layer_tree.blockSignals(False)
+            self.layer_tree.setUpdatesEnabled(True)
             self._layer_panel_updating = False
-            return
-        page = self.document.get_page(self.current_page_index)
-        for element in reversed(page.elements):
-            if isinstance(element, TextElement):
-                preview = element.text.splitlines()[0] if element.text else "Text"
-                label = f"Text: {preview[:15]}"
-            elif isinstance(element, ImageElement):
-                label = element.source_path.name if element.source_path else f"Image {element.id[:6]}"
-            else:
-                label = f"Element {element.id[:6]}"
-            item = QtWidgets.QTreeWidgetItem([label, "", ""])
-            item.setData(0, QtCore.Qt.UserRole, element.id)
-            item.setFlags(
-                QtCore.Qt.ItemIsEnabled
-                | QtCore.Qt.ItemIsSelectable
-                | QtCore.Qt.ItemIsUserCheckable
-            )
-            item.setCheckState(1, QtCore.Qt.Checked if element.visible else QtCore.Qt.Unchecked)
-            item.setCheckState(2, QtCore.Qt.Checked if element.locked else QtCore.Qt.Unchecked)
-            self.layer_tree.addTopLevelItem(item)
-        self.layer_tree.resizeColumnToContents(0)
-        self._layer_panel_updating = False
         self._sync_layer_selection()
 
+    @staticmethod
+    def _layer_label(element: Element) -> str:
+        if isinstance(element, TextElement):
+            preview = element.text.splitlines()[0] if element.text else "Text"
+            return f"Text: {preview[:15]}"
+        if isinstance(element, ImageElement):
+            return element.source_path.name if element.source_path else f"Image {element.id[:6]}"
+        return f"Element {element.id[:6]}"
+
     def _handle_layer_item_changed(self, item: QtWidgets.QTreeWidgetItem, column: int) -> None:
         if self._layer_panel_updating or not self.document or self.current_page_index is None:
             return
@@ -1252,17 +2120,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self._layer_panel_updating = True
         self.layer_tree.blockSignals(True)
         self.layer_tree.clearSelection()
-        selected_ids = {element.id for element in self._selected_elements}
-        for index in range(self.layer_tree.topLevelItemCount()):
-            item = self.layer_tree.topLevelItem(index)
-            if item.data(0, QtCore.Qt.UserRole) in selected_ids:
+        for element in self._selected_elements:
+            item = self._layer_items.get(element.id)
+            if item is not None:
                 item.setSelected(True)
         self.layer_tree.blockSignals(False)
         self._layer_panel_updating = False
 
     def _handle_page_filter_changed(self, text: str) -> None:
         self.page_filter_text = text.strip().lower()
-        self._populate_page_list()
+        self._filter_debounce.start()
+
+    def _apply_page_filter(self) -> None:
+        if self.document:
+            self._filter_page_rows()
         self._update_page_metadata_fields()
 
     def _handle_page_label_edited(self) -> None:
@@ -1272,9 +2143,21 @@ class MainWindow(QtWidgets.QMainWindow):
             or self.current_page_index is None
         ):
             return
-        page = self.document.get_page(self.current_page_index)
+        index = self.current_page_index
+        page = self.document.get_page(index)
         page.label = self.page_label_input.text().strip()
-        self._populate_page_list()
+        # Only this row's text and filter key change; the list is kept.
+        item = self._page_list_items.get(page.uid)
+        if (
+            item is not None
+            and index < len(self._page_filter_keys)
+            and self._page_filter_keys[index][0] == page.uid
+        ):
+            item.setText(self._page_row_text(index, page))
+            self._page_filter_keys[index] = (page.uid, page.label.lower())
+            self._filter_page_rows()
+        else:
+            self._populate_page_list()
         self._mark_unsaved()
 
     def _handle_page_note_changed(self) -> None:
@@ -1284,11 +2167,27 @@ class MainWindow(QtWidgets.QMainWindow):
             or self.current_page_index is None
         ):
             return
-        page = self.document.get_page(self.current_page_index)
-        page.note = self.page_note_input.toPlainText().strip()
-        self._mark_unsaved()
+        self._note_page_uid = self.document.get_page(self.current_page_index).uid
+        self._note_commit_timer.start()
+
+    def _commit_page_note(self) -> None:
+        self._note_commit_timer.stop()
+        page = self.document.find_page_by_id(self._note_page_uid) if self.document and self._note_page_uid else None
+        self._note_page_uid = None
+        if page is None:
+            return
+        note = self.page_note_input.toPlainText().strip()
+        if note != page.note:
+            page.note = note
+            self._mark_unsaved()
+
+    def _flush_page_note(self) -> None:
+        if self._note_commit_timer.isActive():
+            self._commit_page_note()
 
     def _update_page_metadata_fields(self) -> None:
+        # The editor still holds the previous page's note at this point.
+        self._flush_page_note()
         self._page_metadata_updating = True
         if not self.document or self.current_page_index is None:
             self.page_label_input.clear()
@@ -1309,12 +2208,10 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         self.page_list.blockSignals(True)
         matched_row = -1
-        for row in range(self.page_list.count()):
-            item = self.page_list.item(row)
-            if item and item.data(QtCore.Qt.UserRole) == target_id:
-                self.page_list.setCurrentRow(row)
-                matched_row = row
-                break
+        item = self._page_list_items.get(target_id)
+        if item is not None and not item.isHidden():
+            matched_row = self._page_row_by_uid[target_id]
+            self.page_list.setCurrentRow(matched_row)
         self.page_list.blockSignals(False)
         if matched_row >= 0:
             self._handle_page_change(matched_row)
@@ -1333,25 +2230,56 @@ class MainWindow(QtWidgets.QMainWindow):
         if dialog.exec():
             values = dialog.values()
             self.current_theme = values["theme"]
-            self.thumbnail_size = int(values["thumbnail_size"])
+            # The slider handler updates thumbnail_size and schedules the resize.
+            self.page_zoom_slider.setValue(int(values["thumbnail_size"]))
             self.default_page_width = float(values["default_page_width"])
             self.default_page_height = float(values["default_page_height"])
-            self.settings.setValue("theme", self.current_theme)
-            self.settings.setValue("thumbnail_size", self.thumbnail_size)
-            self.settings.setValue("default_page_width", self.default_page_width)
-            self.settings.setValue("default_page_height", self.default_page_height)
-            self.page_zoom_slider.setValue(self.thumbnail_size)
+            self._store_setting("theme", self.current_theme)
+            self._store_setting("thumbnail_size", self.thumbnail_size)
+            self._store_setting("default_page_width", self.default_page_width)
+            self._store_setting("default_page_height", self.default_page_height)
             self._apply_theme(self.current_theme)
 
+    def _store_setting(self, key: str, value: object) -> None:
+        """Write a setting only when it differs from what is stored."""
+
+        if self._settings_values.get(key) == value:
+            return
+        self._settings_values[key] = value
+        self.settings.setValue(key, value)
+
     def _apply_theme(self, theme_name: str) -> None:
         app = QtWidgets.QApplication.instance()
         if not app:
             return
-        apply_stylesheet(app, theme=theme_name)
+        # Rebuilding the application stylesheet restyles every widget, so an
+        # unchanged theme is not reapplied.
+        if theme_name == self._applied_theme:
+            return
+        if theme_name == NO_THEME:
+            app.setStyleSheet("")
+            self._applied_theme = theme_name
+            self.canvas.setBackgroundBrush(_qcolor("#f0f0f0"))
+            self.statusBar().setStyleSheet("")
+            self.statusBar().showMessage("テーマを無効にしました。", 3000)
+            return
         self._palette = self._palette_for_theme(theme_name)
-        base_stylesheet = app.styleSheet()
-        app.setStyleSheet(base_stylesheet + self._build_stylesheet(self._palette))
-        self.canvas.setBackgroundBrush(QtGui.QColor(self._palette["canvas_bg"]))
+        cached = self._theme_stylesheets.get(theme_name)
+        if cached is None:
+            base_stylesheet, text_color = self._material_stylesheet(app, theme_name)
+            cached = (
+                base_stylesheet + self._build_stylesheet(self._palette),
+                QtCore.QDir.searchPaths("icon"),
+                text_color,
+            )
+            self._theme_stylesheets[theme_name] = cached
+        else:
+            # The stylesheet's icon urls resolve against the theme's own icon set.
+            QtCore.QDir.setSearchPaths("icon", cached[1])
+            _restore_material_state(cached[2])
+        app.setStyleSheet(cached[0])
+        self._applied_theme = theme_name
+        self.canvas.setBackgroundBrush(_qcolor(self._palette["canvas_bg"]))
         self.statusBar().setStyleSheet(
             f"background:{self._palette['panel']};"
             f"color:{self._palette['muted_text']};"
@@ -1359,308 +2287,268 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         self.statusBar().showMessage(f"テーマを {theme_name} に変更しました。", 3000)
 
+    def _material_stylesheet(self, app: QtWidgets.QApplication, theme_name: str) -> Tuple[str, str]:
+        """Return the qt-material stylesheet and palette text colour.
+
+        A cached copy is reused when valid; the fonts and palette that
+        apply_stylesheet would have set up are restored from it.
+        """
+
+        try:
+            version = metadata.version("qt-material")
+        except metadata.PackageNotFoundError:
+            version = "unknown"
+        key = hashlib.sha1(f"{theme_name}:{version}".encode("utf-8")).hexdigest()[:16]
+        cache_path = THEME_CACHE_DIR / f"theme.{key}.json"
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = None
+        # The stylesheet references icons generated by qt-material, so the
+        # cache is only usable while those icon directories still exist.
+        if (
+            cached
+            and "text_color" in cached
+            and all(Path(path).is_dir() for path in cached["icon_paths"])
+        ):
+            QtCore.QDir.setSearchPaths("icon", cached["icon_paths"])
+            _restore_material_state(cached["text_color"])
+            return cached["stylesheet"], cached["text_color"]
+
+        from qt_material import apply_stylesheet
+
+        apply_stylesheet(app, theme=theme_name)
+        stylesheet = app.styleSheet()
+        text_color = QtGui.QGuiApplication.palette().color(QtGui.QPalette.Text).name(QtGui.QColor.HexArgb)
+        try:
+            THEME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        "stylesheet": stylesheet,
+                        "icon_paths": QtCore.QDir.searchPaths("icon"),
+                        "text_color": text_color,
+                    }
+                ),
+                encoding="utf-8",
+            )
+        except OSError:
+            pass
+        return stylesheet, text_color
+
     def _palette_for_theme(self, theme_name: str) -> Dict[str, str]:
-        is_light = theme_name.startswith("light")
-        if is_light:
-            return {
-                "surface": "#f6f8fb",
-                "panel": "#ffffff",
-                "card": "#ffffff",
-                "border": "#d8e0ea",
-                "hover": "#eef3fb",
-                "accent": "#2d6cdf",
-                "accent_soft": "#dfe9fb",
-                "accent_hover": "#1f5fc4",
-                "text": "#1f2933",
-                "muted_text": "#516076",
-                "canvas_bg": "#eef2f7",
-                "selection": "#e5edfa",
-            }
-        return {
-            "surface": "#0f172a",
-            "panel": "#0b1326",
-            "card": "#0e1a2f",
-            "border": "#1f2a44",
-            "hover": "#15233a",
-            "accent": "#5ab3f5",
-            "accent_soft": "#12314f",
-            "accent_hover": "#74c3ff",
-            "text": "#e4edf7",
-            "muted_text": "#9fb2c8",
-            "canvas_bg": "#0a101e",
-            "selection": "#1f3a5f",
-        }
+        return LIGHT_PALETTE if theme_name.startswith("light") else DARK_PALETTE
 
     def _build_stylesheet(self, colors: Dict[str, str]) -> str:
-        return f"""
-        /* Modern surface overrides */
-        QWidget {{
-            color: {colors['text']};
-            font-family: "Inter", "Noto Sans", "Segoe UI", sans-serif;
-            font-size: 11pt;
-        }}
-        QMainWindow {{
-            background: {colors['surface']};
-        }}
-        QFrame#SidePanel {{
-            background: {colors['panel']};
-            border: 1px solid {colors['border']};
-            border-radius: 14px;
-        }}
-        QFrame#Card {{
-            background: {colors['card']};
-            border: 1px solid {colors['border']};
-            border-radius: 12px;
-        }}
-        QLabel#CardTitle {{
-            font-size: 10pt;
-            font-weight: 600;
-            color: {colors['muted_text']};
-            padding-bottom: 2px;
-        }}
-        QLabel#FieldLabel {{
-            color: {colors['muted_text']};
-            font-size: 9.5pt;
-            padding-top: 2px;
-        }}
-        QLabel#ThumbnailValueLabel {{
-            color: {colors['muted_text']};
-        }}
-        QGraphicsView#PageCanvas {{
-            background: {colors['canvas_bg']};
-            border: 1px solid {colors['border']};
-            border-radius: 14px;
-        }}
-        QLineEdit,
-        QPlainTextEdit,
-        QSpinBox,
-        QDoubleSpinBox,
-        QComboBox {{
-            background: {colors['surface']};
-            color: {colors['text']};
-            border: 1px solid {colors['border']};
-            border-radius: 8px;
-            padding: 8px 10px;
-        }}
-        QPlainTextEdit {{
-            padding: 10px;
-        }}
-        QLineEdit:focus,
-        QPlainTextEdit:focus,
-        QSpinBox:focus,
-        QDoubleSpinBox:focus,
-        QComboBox:focus {{
-            border: 1px solid {colors['accent']};
-        }}
-        QListWidget#PageList {{
-            background: {colors['card']};
-            border: 1px solid {colors['border']};
-            border-radius: 12px;
-            padding: 6px;
-        }}
-        QListWidget#PageList::item {{
-            background: transparent;
-            margin: 2px;
-            padding: 10px 8px;
-            border-radius: 10px;
-        }}
-        QListWidget#PageList::item:selected {{
-            background: {colors['accent_soft']};
-            border: 1px solid {colors['accent']};
-            color: {colors['text']};
-        }}
-        QListWidget#PageList::item:hover {{
-            background: {colors['hover']};
-        }}
-        QToolBar {{
-            background: {colors['panel']};
-            border: 1px solid {colors['border']};
-            padding: 6px;
-            spacing: 8px;
-        }}
-        QToolBar QToolButton {{
-            padding: 6px 10px;
-            border-radius: 10px;
-        }}
-        QToolBar QToolButton:hover {{
-            background: {colors['hover']};
-        }}
-        QToolBar QToolButton:checked {{
-            background: {colors['accent_soft']};
-            border: 1px solid {colors['accent']};
-        }}
-        QStatusBar {{
-            background: {colors['panel']};
-            border-top: 1px solid {colors['border']};
-            color: {colors['muted_text']};
-        }}
-        QDockWidget {{
-            background: {colors['panel']};
-            border: 1px solid {colors['border']};
-        }}
-        QDockWidget::title {{
-            padding: 8px 10px;
-            background: {colors['panel']};
-            color: {colors['muted_text']};
-            border-bottom: 1px solid {colors['border']};
-        }}
-        QTabWidget::pane {{
-            border: 1px solid {colors['border']};
-            border-radius: 10px;
-            background: {colors['card']};
-        }}
-        QTabBar::tab {{
-            background: {colors['panel']};
-            color: {colors['muted_text']};
-            padding: 8px 14px;
-            border-top-left-radius: 10px;
-            border-top-right-radius: 10px;
-            margin-right: 2px;
-        }}
-        QTabBar::tab:selected {{
-            background: {colors['card']};
-            color: {colors['text']};
-            border: 1px solid {colors['border']};
-            border-bottom: 1px solid {colors['card']};
-        }}
-        QTreeWidget {{
-            background: {colors['card']};
-            border: 1px solid {colors['border']};
-            border-radius: 10px;
-        }}
-        QTreeWidget::item:selected {{
-            background: {colors['accent_soft']};
-            color: {colors['text']};
-        }}
-        QSlider::groove:horizontal {{
-            background: {colors['border']};
-            height: 6px;
-            border-radius: 4px;
-        }}
-        QSlider::handle:horizontal {{
-            background: {colors['accent']};
-            width: 16px;
-            margin: -6px 0;
-            border-radius: 8px;
-        }}
-        QPushButton {{
-            background: {colors['accent']};
-            color: #ffffff;
-            border-radius: 10px;
-            padding: 8px 14px;
-            border: none;
-        }}
-        QPushButton:hover {{
-            background: {colors['accent_hover']};
-        }}
-        QPushButton:disabled {{
-            background: {colors['border']};
-            color: {colors['muted_text']};
-        }}
-        QMenuBar {{
-            background: {colors['panel']};
-            border: none;
-        }}
-        QMenuBar::item:selected {{
-            background: {colors['hover']};
-        }}
-        QMenu {{
-            background: {colors['card']};
-            border: 1px solid {colors['border']};
-        }}
-        QMenu::item:selected {{
-            background: {colors['accent_soft']};
-        }}
-        """
+        return _OVERRIDE_QSS.substitute(colors)
 
     def _mark_unsaved(self) -> None:
         self._unsaved_changes = True
+        self._autosave_idle_timer.start()
+        if self._autosave_pending:
+            return
+        self._autosave_pending = True
         self.autosave_status_label.setText("AutoSave: 未保存")
 
     def _handle_autosave_timeout(self) -> None:
-        if not self._unsaved_changes or not self.document:
+        if not self._autosave_pending or not self.document or self._export_job or self._autosave_job:
+            return
+        if self._autosave_idle_timer.isActive():
+            # Writing the whole document mid-interaction would stall it; save
+            # once the user pauses instead.
+            self._autosave_deferred = True
             return
+        self._autosave_deferred = False
         try:
-            path = self._perform_autosave()
-            if path:
-                self.autosave_status_label.setText(f"AutoSave: {path.name}")
+            self._perform_autosave()
         except Exception as exc:  # pylint: disable=broad-except
-            self.statusBar().showMessage(f"自動保存に失敗しました: {exc}", 5000)
+            self._handle_autosave_failed(str(exc))
 
-    def _perform_autosave(self) -> Optional[Path]:
-        if not self.document:
-            return None
-        autosave_dir = Path.home() / ".cache" / "pdf_editor"
-        autosave_dir.mkdir(parents=True, exist_ok=True)
+    def _handle_autosave_idle(self) -> None:
+        if self._autosave_deferred:
+            self._handle_autosave_timeout()
+
+    def _perform_autosave(self) -> None:
+        if not self.document or self._autosave_job:
+            return
+        self._flush_page_note()
+        if not self._autosave_dir_ready:
+            AUTOSAVE_DIR.mkdir(parents=True, exist_ok=True)
+            self._autosave_dir_ready = True
         source_name = self.document.source_path.stem if self.document.source_path else "document"
-        target_path = autosave_dir / f"{source_name}_autosave.pdf"
-        self.exporter.export(self.document, target_path)
-        return target_path
+        target_path = AUTOSAVE_DIR / f"{source_name}_autosave.pdf"
+        # The export runs on the thread pool against a snapshot so the UI
+        # keeps responding while large documents are written.
+        snapshot = self.document.snapshot()
+        fingerprint = _document_fingerprint(snapshot)
+        if fingerprint == self._autosave_fingerprint:
+            # Edits cancelled each other out; the autosave file is current.
+            self._autosave_pending = False
+            self.autosave_status_label.setText("AutoSave: 保存済み")
+            return
+        job = ExportRunnable(self.exporter, snapshot, target_path)
+        job.signals.finished.connect(self._handle_autosave_finished)
+        job.signals.failed.connect(self._handle_autosave_failed)
+        self._autosave_job = job
+        self._autosave_job_fingerprint = fingerprint
+        # Edits made while the job runs mark the document pending again.
+        self._autosave_pending = False
+        self.autosave_status_label.setText("AutoSave: 保存中...")
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _handle_autosave_finished(self, target_path: str) -> None:
+        self._autosave_job = None
+        self._autosave_fingerprint = self._autosave_job_fingerprint
+        if not self._autosave_pending:
+            self.autosave_status_label.setText(f"AutoSave: {Path(target_path).name}")
+
+    def _handle_autosave_failed(self, message: str) -> None:
+        self._autosave_job = None
+        # The directory may have been removed; recreate it on the next try.
+        self._autosave_dir_ready = False
+        self._autosave_pending = True
+        self.autosave_status_label.setText("AutoSave: 未保存")
+        self.statusBar().showMessage(f"自動保存に失敗しました: {message}", 5000)
 
     def _show_canvas_context_menu(self, position: QtCore.QPoint) -> None:
         if not self._selected_element:
             return
-        menu = QtWidgets.QMenu(self)
-        menu.addAction(self.duplicate_element_action)
+        if self._canvas_menu is None:
+            self._canvas_menu = QtWidgets.QMenu(self)
+            self._canvas_menu.addAction(self.duplicate_element_action)
+            self._canvas_menu.addAction(self.delete_element_action)
+            self._canvas_menu.addSeparator()
+            self._canvas_menu.addAction(self.bring_forward_action)
+            self._canvas_menu.addAction(self.send_backward_action)
+        menu = self._canvas_menu
+        # The text action is shared with the menu bar and toolbar, so it is
+        # inserted or removed here rather than hidden.
         if len(self._selected_elements) == 1 and isinstance(self._selected_elements[0], TextElement):
-            menu.addAction(self.edit_text_action)
-        menu.addAction(self.delete_element_action)
-        menu.addSeparator()
-        menu.addAction(self.bring_forward_action)
-        menu.addAction(self.send_backward_action)
-        global_pos = self.canvas.mapToGlobal(position)
-        menu.exec(global_pos)
+            menu.insertAction(self.delete_element_action, self.edit_text_action)
+        else:
+            menu.removeAction(self.edit_text_action)
+        menu.exec(self.canvas.mapToGlobal(position))
 
     def _show_shortcut_overlay(self) -> None:
-        shortcuts = [
-            ("Ctrl+O", "PDFを開く"),
-            ("Ctrl+S / Ctrl+Shift+S", "保存 / 名前を付けて保存"),
-            ("Ctrl+I", "画像を挿入"),
-            ("Ctrl+D", "選択要素を複製"),
-            ("Delete", "選択要素を削除"),
-            ("Ctrl+Z / Ctrl+Shift+Z", "元に戻す / やり直す"),
-            ("Ctrl+Shift+N", "ページ追加"),
-            ("Ctrl+PgUp / Ctrl+PgDn", "ページ移動 (上/下)"),
-            ("F1", "ショートカット一覧を表示"),
-            ("Ctrl+Mouse Wheel", "ズーム"),
-        ]
+        if self._shortcut_dialog is None:
+            self._shortcut_dialog = self._build_shortcut_overlay()
+        self._shortcut_dialog.exec()
+
+    def _build_shortcut_overlay(self) -> QtWidgets.QDialog:
         dialog = QtWidgets.QDialog(self)
         dialog.setWindowTitle("ショートカット一覧")
         layout = QtWidgets.QVBoxLayout(dialog)
-        table = QtWidgets.QTableWidget(len(shortcuts), 2)
-        table.setHorizontalHeaderLabels(["キー", "説明"])
+        table = QtWidgets.QTableView()
+        table.setModel(ShortcutTableModel(table))
         table.horizontalHeader().setStretchLastSection(True)
         table.verticalHeader().setVisible(False)
         table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
-        for row, (keys, desc) in enumerate(shortcuts):
-            table.setItem(row, 0, QtWidgets.QTableWidgetItem(keys))
-            table.setItem(row, 1, QtWidgets.QTableWidgetItem(desc))
         layout.addWidget(table)
         close_button = QtWidgets.QPushButton("閉じる")
         close_button.clicked.connect(dialog.accept)
         layout.addWidget(close_button, alignment=QtCore.Qt.AlignRight)
         dialog.resize(420, 300)
-        dialog.exec()
+        return dialog
+
+    def _prefetch_neighbour_pages(self, page_index: int) -> None:
+        """Render the pages either side of ``page_index`` on the thread pool."""
+
+        if not self.document or not self.page_previews or self.page_previews.closed:
+            return
+        if self._prefetch_job is not None:
+            return
+        pages = []
+        for neighbour in (page_index + 1, page_index - 1):
+            if not 0 <= neighbour < self.document.page_count:
+                continue
+            page = self.document.get_page(neighbour)
+            if page.source_index is None or page.uid in self.page_images:
+                continue
+            pages.append((page.uid, page.source_index))
+        if not pages:
+            return
+        job = PagePrefetchRunnable(self.page_previews, page_index, pages)
+        job.signals.ready.connect(self._handle_prefetched_page)
+        job.signals.finished.connect(self._handle_prefetch_finished)
+        self._prefetch_job = job
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _handle_prefetched_page(self, previews: LazyPreviewCache, page_uid: str, image: QtGui.QImage) -> None:
+        if previews is not self.page_previews or image.isNull() or page_uid in self.page_images:
+            return
+        self.page_images.put(page_uid, image)
+
+    def _handle_prefetch_finished(self) -> None:
+        job = self._prefetch_job
+        self._prefetch_job = None
+        # Navigation that happened while the job ran gets its own prefetch.
+        if job is not None and self.current_page_index not in (None, job.page_index):
+            self._prefetch_neighbour_pages(self.current_page_index)
+
+    def _get_page_image(self, page: PageModel) -> QtGui.QImage:
+        image = self.page_images.get(page.uid)
+        if image is None or image.isNull():
+            image = QtGui.QImage()
+            if page.source_index is not None and self.page_previews:
+                # Wrap MuPDF's RGB scanlines directly instead of a JPEG round
+                # trip; copy() detaches the image from the samples buffer.
+                raw = self.page_previews.render_raw(page.source_index)
+                image = QtGui.QImage(
+                    raw.samples,
+                    raw.width,
+                    raw.height,
+                    raw.stride,
+                    QtGui.QImage.Format_RGB888,
+                ).copy()
+            if image.isNull():
+                image = self._create_blank_pixmap(page.width, page.height).toImage()
+            self.page_images.put(page.uid, image)
+        return image
 
     def _get_page_pixmap(self, page: PageModel) -> QtGui.QPixmap:
-        pixmap = self.page_pixmaps.get(page.uid)
-        if pixmap is None or pixmap.isNull():
-            pixmap = self._create_blank_pixmap(page.width, page.height)
-            self.page_pixmaps[page.uid] = pixmap
+        if self._current_page_pixmap and self._current_page_pixmap[0] == page.uid:
+            return self._current_page_pixmap[1]
+        # Replacing the previous entry releases the off-screen page's pixmap.
+        pixmap = QtGui.QPixmap.fromImage(self._get_page_image(page))
+        self._current_page_pixmap = (page.uid, pixmap)
         return pixmap
 
+    def _get_thumbnail_image(self, page: PageModel) -> QtGui.QImage:
+        image = self.page_images.get(page.uid)
+        if image is not None and not image.isNull():
+            return image
+        if page.source_index is None:
+            # Blank pages are drawn at thumbnail size; the full-size background
+            # is only allocated once the page is opened on the canvas.
+            size = QtCore.QSizeF(page.width, page.height).scaled(
+                QtCore.QSizeF(thumbnail_box(max(THUMBNAIL_PRESCALE_SIZES))), QtCore.Qt.KeepAspectRatio
+            )
+            return self._create_blank_pixmap(size.width(), size.height()).toImage()
+        if not self.page_previews:
+            return self._get_page_image(page)
+        # Thumbnails come from a low-resolution render; the full page is only
+        # rasterized when it is opened on the canvas.
+        return decode_scaled(
+            self.page_previews.get_thumbnail(page.source_index),
+            self.page_previews.image_format,
+            thumbnail_box(max(THUMBNAIL_PRESCALE_SIZES)),
+        )
+
     def _create_blank_pixmap(self, width: float, height: float) -> QtGui.QPixmap:
         width_px = max(1, int(width))
         height_px = max(1, int(height))
+        # Rendered blanks live in QPixmapCache so they are evicted with the
+        # thumbnails; copies share the pixel data.
+        cache_key = f"blank:{width_px}x{height_px}"
+        pixmap = QtGui.QPixmap()
+        if QtGui.QPixmapCache.find(cache_key, pixmap):
+            return pixmap
         pixmap = QtGui.QPixmap(width_px, height_px)
-        pixmap.fill(QtGui.QColor("#ffffff"))
+        pixmap.fill(_BLANK_FILL)
         painter = QtGui.QPainter(pixmap)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        pen = QtGui.QPen(QtGui.QColor("#c5c5c5"))
-        pen.setStyle(QtCore.Qt.DotLine)
-        pen.setWidth(2)
-        painter.setPen(pen)
+        painter.setPen(_BLANK_BORDER_PEN)
         margin = 4
         painter.drawRect(
             margin,
@@ -1669,17 +2557,26 @@ class MainWindow(QtWidgets.QMainWindow):
             max(1, pixmap.height() - margin * 2),
         )
         painter.end()
+        QtGui.QPixmapCache.insert(cache_key, pixmap)
         return pixmap
 
     def _update_page_actions(self) -> None:
-        has_document = self.document is not None
-        page_count = self.document.page_count if self.document else 0
-        has_pages = has_document and page_count > 0
-        self.add_page_action.setEnabled(has_document)
-        can_modify = has_pages and self.current_page_index is not None
-        self.remove_page_action.setEnabled(can_modify and page_count > 1)
-        self.move_page_up_action.setEnabled(can_modify and self.current_page_index not in (None, 0))
-        self.move_page_down_action.setEnabled(
-            can_modify and self.current_page_index is not None and self.current_page_index < page_count - 1
+        document = self.document
+        index = self.current_page_index
+        has_document = document is not None
+        page_count = document.page_count if has_document else 0
+        can_modify = page_count > 0 and index is not None
+        state = (
+            has_document,
+            can_modify and page_count > 1,
+            can_modify and index > 0,
+            can_modify and index < page_count - 1,
         )
+        if state == self._page_action_state:
+            return
+        self._page_action_state = state
+        self.add_page_action.setEnabled(has_document)
+        self.remove_page_action.setEnabled(state[1])
+        self.move_page_up_action.setEnabled(state[2])
+        self.move_page_down_action.setEnabled(state[3])
         self.toggle_grid_action.setEnabled(has_document)
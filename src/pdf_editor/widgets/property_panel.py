@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Tuple
 
 from PySide6 import QtCore, QtWidgets
 
 from ..document import ImageElement
 
 
+# Spin box and slider steps arriving within this window are emitted once.
+EDIT_DEBOUNCE_MS = 40
+
+# Geometry spin box setup, shared by every spin box the panel creates.
+_SPIN_RANGE = (0.0, 5000.0)
+_SPIN_STEP = 5.0
+_SPIN_DECIMALS = 1
+_SPIN_MIN_WIDTH = 120
+
+
 class PropertyPanel(QtWidgets.QWidget):
     """Panel that exposes the numeric geometry controls for an element."""
 
@@ -16,14 +26,16 @@ class PropertyPanel(QtWidgets.QWidget):
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None):
         super().__init__(parent)
         self._active_element: Optional[ImageElement] = None
-        self._updating = False
+        self._page_size: Optional[Tuple[float, float]] = None
+        # Opacity the active element has, as far as this panel knows.
+        self._last_emitted_opacity: Optional[float] = None
 
         main_layout = QtWidgets.QVBoxLayout(self)
         self.tabs = QtWidgets.QTabWidget()
         main_layout.addWidget(self.tabs)
 
-        geometry_widget = QtWidgets.QWidget()
-        layout = QtWidgets.QFormLayout(geometry_widget)
+        self._geometry_container = QtWidgets.QWidget()
+        layout = QtWidgets.QFormLayout(self._geometry_container)
         layout.setContentsMargins(16, 16, 16, 16)
         layout.setSpacing(12)
         self.x_spin = self._create_spin_box()
@@ -35,34 +47,28 @@ class PropertyPanel(QtWidgets.QWidget):
         layout.addRow("Y", self.y_spin)
         layout.addRow("Width", self.width_spin)
         layout.addRow("Height", self.height_spin)
-        self.tabs.addTab(geometry_widget, "位置/サイズ")
+        self.tabs.addTab(self._geometry_container, "位置/サイズ")
 
-        style_widget = QtWidgets.QWidget()
-        style_layout = QtWidgets.QVBoxLayout(style_widget)
-        style_layout.setContentsMargins(16, 16, 16, 16)
-        style_layout.setSpacing(12)
-        opacity_row = QtWidgets.QHBoxLayout()
-        opacity_label = QtWidgets.QLabel("透明度")
-        self.opacity_value_label = QtWidgets.QLabel("100%")
-        opacity_row.addWidget(opacity_label)
-        opacity_row.addStretch()
-        opacity_row.addWidget(self.opacity_value_label)
-        style_layout.addLayout(opacity_row)
-        self.opacity_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
-        self.opacity_slider.setRange(10, 100)
-        self.opacity_slider.setSingleStep(5)
-        self.opacity_slider.setValue(100)
-        style_layout.addWidget(self.opacity_slider)
-        style_layout.addStretch()
-        self.tabs.addTab(style_widget, "スタイル")
+        # The style controls are built the first time their tab is opened.
+        self._style_container = QtWidgets.QWidget()
+        self._style_tab_index = self.tabs.addTab(self._style_container, "スタイル")
+        self.opacity_value_label: Optional[QtWidgets.QLabel] = None
+        self.opacity_slider: Optional[QtWidgets.QSlider] = None
+
+        self._geometry_timer = self._create_debounce_timer(self._emit_geometry)
+        self._opacity_timer = self._create_debounce_timer(self._emit_opacity)
 
         for spin in (self.x_spin, self.y_spin, self.width_spin, self.height_spin):
             spin.valueChanged.connect(self._handle_value_changed)
-        self.opacity_slider.valueChanged.connect(self._handle_opacity_changed)
+        self.tabs.currentChanged.connect(self._handle_tab_changed)
 
         self._set_enabled(False)
 
     def set_page_size(self, width: float, height: float) -> None:
+        # Every page switch calls this; most documents use one page size.
+        if (width, height) == self._page_size:
+            return
+        self._page_size = (width, height)
         x_max = max(width, 1000)
         y_max = max(height, 1000)
         for spin in (self.x_spin, self.width_spin):
@@ -71,30 +77,95 @@ class PropertyPanel(QtWidgets.QWidget):
             spin.setMaximum(y_max)
 
     def set_element(self, element: Optional[ImageElement]) -> None:
+        if element is self._active_element:
+            # The same element echoed back from the canvas: its values win.
+            self._geometry_timer.stop()
+            self._opacity_timer.stop()
+        else:
+            # A pending edit still belongs to the previous element.
+            self._flush_pending()
         self._active_element = element
         self._set_enabled(element is not None)
         if not element:
+            self._last_emitted_opacity = None
             return
-        self._updating = True
+        self._last_emitted_opacity = element.opacity
+        # Echoed canvas edits must not bounce back as geometryEdited.
+        blockers = [
+            QtCore.QSignalBlocker(widget)
+            for widget in (self.x_spin, self.y_spin, self.width_spin, self.height_spin)
+        ]
         self.x_spin.setValue(element.rect.x)
         self.y_spin.setValue(element.rect.y)
         self.width_spin.setValue(element.rect.width)
         self.height_spin.setValue(element.rect.height)
+        for blocker in blockers:
+            blocker.unblock()
+        self._show_opacity(element)
+
+    def _handle_tab_changed(self, index: int) -> None:
+        if index == self._style_tab_index and self.opacity_slider is None:
+            self._build_style_tab()
+
+    def _build_style_tab(self) -> None:
+        style_layout = QtWidgets.QVBoxLayout(self._style_container)
+        style_layout.setContentsMargins(16, 16, 16, 16)
+        style_layout.setSpacing(12)
+        opacity_row = QtWidgets.QHBoxLayout()
+        opacity_label = QtWidgets.QLabel("透明度")
+        self.opacity_value_label = QtWidgets.QLabel("100%")
+        opacity_row.addWidget(opacity_label)
+        opacity_row.addStretch()
+        opacity_row.addWidget(self.opacity_value_label)
+        style_layout.addLayout(opacity_row)
+        self.opacity_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.opacity_slider.setRange(10, 100)
+        self.opacity_slider.setSingleStep(5)
+        self.opacity_slider.setValue(100)
+        style_layout.addWidget(self.opacity_slider)
+        style_layout.addStretch()
+        self.opacity_slider.valueChanged.connect(self._handle_opacity_changed)
+        if self._active_element:
+            self._show_opacity(self._active_element)
+
+    def _show_opacity(self, element: ImageElement) -> None:
+        if self.opacity_slider is None:
+            return
         opacity_value = int(element.opacity * 100)
-        self.opacity_slider.setValue(opacity_value)
+        with QtCore.QSignalBlocker(self.opacity_slider):
+            self.opacity_slider.setValue(opacity_value)
         self.opacity_value_label.setText(f"{opacity_value}%")
-        self._updating = False
 
     def _create_spin_box(self) -> QtWidgets.QDoubleSpinBox:
         spin = QtWidgets.QDoubleSpinBox()
-        spin.setDecimals(1)
-        spin.setRange(0.0, 5000.0)
-        spin.setSingleStep(5.0)
-        spin.setMinimumWidth(120)
+        spin.setDecimals(_SPIN_DECIMALS)
+        spin.setRange(*_SPIN_RANGE)
+        spin.setSingleStep(_SPIN_STEP)
+        spin.setMinimumWidth(_SPIN_MIN_WIDTH)
         return spin
 
+    def _create_debounce_timer(self, slot) -> QtCore.QTimer:
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(EDIT_DEBOUNCE_MS)
+        timer.timeout.connect(slot)
+        return timer
+
+    def _flush_pending(self) -> None:
+        if self._geometry_timer.isActive():
+            self._geometry_timer.stop()
+            self._emit_geometry()
+        if self._opacity_timer.isActive():
+            self._opacity_timer.stop()
+            self._emit_opacity()
+
     def _handle_value_changed(self, _value: float) -> None:
-        if not self._active_element or self._updating:
+        if not self._active_element:
+            return
+        self._geometry_timer.start()
+
+    def _emit_geometry(self) -> None:
+        if not self._active_element:
             return
         self.geometryEdited.emit(
             self.x_spin.value(),
@@ -104,13 +175,22 @@ class PropertyPanel(QtWidgets.QWidget):
         )
 
     def _handle_opacity_changed(self, value: int) -> None:
-        if not self._active_element or self._updating:
+        if not self._active_element:
             return
         self.opacity_value_label.setText(f"{value}%")
-        self.opacityEdited.emit(max(0.1, value / 100.0))
+        self._opacity_timer.start()
+
+    def _emit_opacity(self) -> None:
+        if not self._active_element:
+            return
+        opacity = max(0.1, self.opacity_slider.value() / 100.0)
+        # Slider steps that land back on the current value change nothing.
+        if opacity == self._last_emitted_opacity:
+            return
+        self._last_emitted_opacity = opacity
+        self.opacityEdited.emit(opacity)
 
     def _set_enabled(self, enabled: bool) -> None:
-        for spin in (self.x_spin, self.y_spin, self.width_spin, self.height_spin):
-            spin.setEnabled(enabled)
-        self.opacity_slider.setEnabled(enabled)
-        self.opacity_value_label.setEnabled(enabled)
+        # Children, including style controls built later, follow their tab page.
+        self._geometry_container.setEnabled(enabled)
+        self._style_container.setEnabled(enabled)
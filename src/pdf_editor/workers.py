@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from PySide6 import QtCore, QtGui
+
+from .document import DocumentModel
+from .pdf_io import ExportCancelled, LazyPreviewCache, PdfExporter, PdfImporter
+
+# Page-list thumbnail widths rendered up front. Each row's icon holds all of
+# them, so changing the list's icon size needs no re-render.
+THUMBNAIL_PRESCALE_SIZES = (80, 110, 150, 200)
+
+
+def thumbnail_box(width: int) -> QtCore.QSize:
+    """Bounding box of a page-list thumbnail ``width`` pixels wide."""
+
+    return QtCore.QSize(width, int(width * 1.4))
+
+
+def prescale_thumbnail(image: QtGui.QImage) -> List[QtGui.QImage]:
+    """Scale ``image`` to every THUMBNAIL_PRESCALE_SIZES box; safe off the UI thread."""
+
+    return [
+        image.scaled(thumbnail_box(width), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        for width in THUMBNAIL_PRESCALE_SIZES
+    ]
+
+
+def decode_scaled(data: bytes, image_format: str, box: QtCore.QSize) -> QtGui.QImage:
+    """Decode ``data`` to fit within ``box``, letting the decoder downscale.
+
+    JPEG in particular can decode at a fraction of its size, so the full
+    resolution image is never materialised. Images already within ``box``
+    are decoded as they are.
+    """
+
+    buffer = QtCore.QBuffer()
+    buffer.setData(QtCore.QByteArray(data))
+    buffer.open(QtCore.QIODevice.ReadOnly)
+    reader = QtGui.QImageReader(buffer, image_format.encode("ascii"))
+    size = reader.size()
+    if size.isValid() and (size.width() > box.width() or size.height() > box.height()):
+        reader.setScaledSize(size.scaled(box, QtCore.Qt.KeepAspectRatio))
+    return reader.read()
+
+
+class LoadSignals(QtCore.QObject):
+    loaded = QtCore.Signal(object, object, object)
+    failed = QtCore.Signal(str)
+
+
+class LoadRunnable(QtCore.QRunnable):
+    """Opens a PDF on a thread-pool thread.
+
+    Emits ``loaded(document, previews, doc_key)``. ``doc_key`` identifies the
+    file version by path, size and modification time, and is ``None`` when
+    the file could not be stat'ed.
+    """
+
+    def __init__(self, importer: PdfImporter, path: Path):
+        super().__init__()
+        self.signals = LoadSignals()
+        self._path = path
+        self._importer = importer
+
+    def run(self) -> None:
+        try:
+            document, previews = self._importer.load(self._path)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.loaded.emit(document, previews, self._file_key())
+
+    def _file_key(self) -> Optional[str]:
+        # Hashing the contents would read the whole file again before the
+        # document can appear; a stat is enough to tell file versions apart.
+        try:
+            path = self._path.resolve()
+            stat = path.stat()
+        except OSError:
+            return None
+        key = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ExportSignals(QtCore.QObject):
+    progress = QtCore.Signal(int, int)
+    finished = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+    cancelled = QtCore.Signal()
+
+
+class ExportRunnable(QtCore.QRunnable):
+    """Runs PdfExporter.export on a thread-pool thread.
+
+    The document should be a snapshot so that later edits on the UI thread do
+    not race with the export. Results are reported through ``signals``.
+    """
+
+    def __init__(self, exporter: PdfExporter, document: DocumentModel, target_path: Path):
+        super().__init__()
+        self.signals = ExportSignals()
+        self._exporter = exporter
+        self._document = document
+        self._target_path = target_path
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            self._exporter.export(
+                self._document,
+                self._target_path,
+                progress=self.signals.progress.emit,
+                is_cancelled=self._cancel_event.is_set,
+            )
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as exc:  # pylint: disable=broad-except
+            self.signals.failed.emit(str(exc))
+        else:
+            self.signals.finished.emit(str(self._target_path))
+
+
+class ImageDecodeSignals(QtCore.QObject):
+    decoded = QtCore.Signal(bytes, QtGui.QImage)
+
+
+class ImageDecodeRunnable(QtCore.QRunnable):
+    """Decodes encoded image bytes into a QImage on a thread-pool thread.
+
+    ``key`` is passed back with the result so the receiver can match it to
+    the items waiting for it; the QImage may be null if decoding failed.
+    """
+
+    def __init__(self, key: bytes, data: bytes):
+        super().__init__()
+        self.signals = ImageDecodeSignals()
+        self._key = key
+        self._data = data
+
+    def run(self) -> None:
+        image = QtGui.QImage.fromData(self._data)
+        # Qt's smooth scaler works natively in premultiplied ARGB; converting
+        # here spares every later resize a format conversion.
+        if not image.isNull() and image.format() != QtGui.QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+        self.signals.decoded.emit(self._key, image)
+
+
+class ThumbnailSignals(QtCore.QObject):
+    ready = QtCore.Signal(int, str, object)
+
+
+class ThumbnailRunnable(QtCore.QRunnable):
+    """Renders and scales one page-list thumbnail on a thread-pool thread.
+
+    Emits ``ready(generation, page_uid, images)`` with one QImage per
+    THUMBNAIL_PRESCALE_SIZES entry, or an empty list if rendering failed;
+    ``generation`` lets the receiver drop results for a page list that has
+    since been rebuilt.
+    """
+
+    def __init__(
+        self,
+        previews: LazyPreviewCache,
+        source_index: int,
+        generation: int,
+        page_uid: str,
+        cache_path: Optional[Path] = None,
+    ):
+        super().__init__()
+        self.signals = ThumbnailSignals()
+        self._previews = previews
+        self._source_index = source_index
+        self._size = thumbnail_box(max(THUMBNAIL_PRESCALE_SIZES))
+        self._generation = generation
+        self._page_uid = page_uid
+        self._cache_path = cache_path
+
+    def run(self) -> None:
+        # Only the largest size is kept on disk; smaller ones are cheap to redo.
+        image = self._read_cached()
+        if image.isNull():
+            image = self._render()
+            if not image.isNull():
+                self._write_cached(image)
+        images = prescale_thumbnail(image) if not image.isNull() else []
+        self.signals.ready.emit(self._generation, self._page_uid, images)
+
+    def _render(self) -> QtGui.QImage:
+        try:
+            data = self._previews.get_thumbnail(self._source_index)
+        except (RuntimeError, ValueError):
+            # The document was closed or replaced while the job was queued.
+            return QtGui.QImage()
+        image = decode_scaled(data, self._previews.image_format, self._size)
+        if image.isNull():
+            return image
+        return image.scaled(
+            self._size,
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation,
+        )
+
+    def _read_cached(self) -> QtGui.QImage:
+        if self._cache_path is None or not self._cache_path.is_file():
+            return QtGui.QImage()
+        image = QtGui.QImage(str(self._cache_path))
+        if not image.isNull():
+            # Pruning evicts the least recently used files first.
+            try:
+                os.utime(self._cache_path)
+            except OSError:
+                pass
+        return image
+
+    def _write_cached(self, image: QtGui.QImage) -> None:
+        if self._cache_path is None:
+            return
+        partial = self._cache_path.with_name(f"{self._cache_path.name}.{threading.get_ident()}.part")
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            if image.save(str(partial), "PNG"):
+                os.replace(partial, self._cache_path)
+        except OSError:
+            pass
+
+
+class CachePruneRunnable(QtCore.QRunnable):
+    """Trims a cache directory to ``limit_bytes``, oldest-modified files first."""
+
+    def __init__(self, directory: Path, limit_bytes: int):
+        super().__init__()
+        self._directory = directory
+        self._limit_bytes = limit_bytes
+
+    def run(self) -> None:
+        try:
+            entries = [(entry.stat(), entry) for entry in self._directory.iterdir() if entry.is_file()]
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _entry in entries)
+        for stat, entry in sorted(entries, key=lambda pair: pair[0].st_mtime):
+            if total <= self._limit_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= stat.st_size
+
+
+class PagePrefetchSignals(QtCore.QObject):
+    ready = QtCore.Signal(object, str, QtGui.QImage)
+    finished = QtCore.Signal()
+
+
+class PagePrefetchRunnable(QtCore.QRunnable):
+    """Renders full-size page backgrounds ahead of navigation.
+
+    Each ``(page_uid, source_index)`` is rendered to a detached QImage and
+    reported with ``ready(previews, page_uid, image)`` so the receiver can
+    discard results that belong to a document it has since closed.
+    """
+
+    def __init__(self, previews: LazyPreviewCache, page_index: int, pages: List[Tuple[str, int]]):
+        super().__init__()
+        self.signals = PagePrefetchSignals()
+        self.page_index = page_index
+        self._previews = previews
+        self._pages = pages
+
+    def run(self) -> None:
+        try:
+            for page_uid, source_index in self._pages:
+                try:
+                    raw = self._previews.render_raw(source_index)
+                except (RuntimeError, ValueError):
+                    return
+                image = QtGui.QImage(
+                    raw.samples,
+                    raw.width,
+                    raw.height,
+                    raw.stride,
+                    QtGui.QImage.Format_RGB888,
+                ).copy()
+                self.signals.ready.emit(self._previews, page_uid, image)
+        finally:
+            self.signals.finished.emit()
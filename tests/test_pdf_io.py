@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import fitz
+
+from pdf_editor.document import DocumentModel, PageModel, create_image_element, create_text_element
+from pdf_editor.pdf_io import PdfExporter
+
+
+class PdfExporterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+        source = fitz.open()
+        source.new_page(width=300, height=300)
+        self.source_path = self.tmp_path / "source.pdf"
+        source.save(self.source_path)
+        source.close()
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _export(self, *elements) -> str:
+        page = PageModel(width=300, height=300, source_index=0, elements=list(elements))
+        document = DocumentModel(source_path=self.source_path, pages=[page])
+        target = self.tmp_path / "out.pdf"
+        PdfExporter().export(document, target)
+        with fitz.open(target) as exported:
+            return exported[0].get_text()
+
+    def test_repeated_image_is_stored_once(self) -> None:
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+        pixmap.clear_with(128)
+        image_bytes = pixmap.tobytes("png")
+        pages = [
+            PageModel(
+                width=300,
+                height=300,
+                elements=[
+                    create_image_element(
+                        10, 10, 50, 50, source_path=Path("image.png"), image_bytes=image_bytes
+                    )
+                ],
+            )
+            for _ in range(2)
+        ]
+        pages[1].elements[0].opacity = 0.5
+        target = self.tmp_path / "images.pdf"
+
+        PdfExporter().export(DocumentModel(source_path=self.source_path, pages=pages), target)
+
+        with fitz.open(target) as exported:
+            xrefs = {image[0] for page in exported for image in page.get_images()}
+        self.assertEqual(len(xrefs), 1)
+
+    def test_overflowing_text_box_is_skipped(self) -> None:
+        overflowing = create_text_element(10, 10, 60, 14, text="\n".join(f"line {i}" for i in range(9)))
+        fitting = create_text_element(10, 100, 200, 40, text="kept")
+
+        text = self._export(overflowing, fitting)
+
+        self.assertIn("kept", text)
+        self.assertNotIn("line 0", text)
+
+    def test_text_keeps_stacking_order_across_colours(self) -> None:
+        first = create_text_element(10, 10, 200, 30, text="first", color="#ff0000")
+        second = create_text_element(10, 50, 200, 30, text="second", color="#0000ff")
+        third = create_text_element(10, 90, 200, 30, text="third", color="#ff0000")
+
+        text = self._export(first, second, third)
+
+        self.assertLess(text.index("first"), text.index("second"))
+        self.assertLess(text.index("second"), text.index("third"))
+
+    def test_text_starts_at_box_origin_without_embedded_font(self) -> None:
+        element = create_text_element(10, 10, 200, 30, text="origin", font_size=12)
+        page = PageModel(width=300, height=300, source_index=0, elements=[element])
+        target = self.tmp_path / "origin.pdf"
+
+        PdfExporter().export(DocumentModel(source_path=self.source_path, pages=[page]), target)
+
+        with fitz.open(target) as exported:
+            words = exported[0].get_text("words")
+            fonts = exported[0].get_fonts()
+        self.assertAlmostEqual(words[0][0], 10.0, delta=0.5)
+        self.assertTrue(fonts)
+        self.assertTrue(all(font[1] == "n/a" for font in fonts))
+
+
+if __name__ == "__main__":
+    unittest.main()